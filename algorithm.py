@@ -1,59 +1,274 @@
 # Import necessary libraries
+import argparse
+import sys
+import time
+from collections import deque
+from itertools import combinations, islice
+from math import isqrt
+from multiprocessing import Pool, cpu_count
 from random import randint, random, shuffle
 
+# Initialize the symbols used for entries on boards larger than 9x9
+symbols = "123456789ABCDEFGHIJKLMNOP"
+
+
+class Geometry:
+    def __init__(self, sub_size):
+        # Initialize the dimensions of the board
+        self.sub_size = sub_size
+        self.board_size = sub_size * sub_size
+        self.total_cells = self.board_size * self.board_size
+        self.all_digits = (1 << self.board_size) - 1
+        size, cells = self.board_size, range(self.board_size * self.board_size)
+
+        # Initialize lookup tables for the row, column and sub matrix of every cell
+        self.cell_row = [cell // size for cell in cells]
+        self.cell_col = [cell % size for cell in cells]
+        self.cell_sub = [sub_size * (self.cell_row[cell] // sub_size) + self.cell_col[cell] // sub_size for cell in cells]
+
+        # Initialize the units as rows, then columns, then sub matrices
+        self.units = [[cell for cell in cells if self.cell_row[cell] == line] for line in range(size)] + \
+                     [[cell for cell in cells if self.cell_col[cell] == line] for line in range(size)] + \
+                     [[cell for cell in cells if self.cell_sub[cell] == line] for line in range(size)]
+        self.cell_units = [(self.cell_row[cell], size + self.cell_col[cell], 2 * size + self.cell_sub[cell]) for cell in cells]
+        self.peers = [sorted(set(self.units[self.cell_units[cell][0]] + self.units[self.cell_units[cell][1]] +
+                                 self.units[self.cell_units[cell][2]]) - {cell}) for cell in cells]
+
+        # Initialize a solved grid built from the shifted row pattern
+        self.seed_grid = [[(sub_size * (x % sub_size) + x // sub_size + y) % size + 1 for y in range(size)]
+                          for x in range(size)]
+
+
+# Initialize the geometry of each board size once it is first needed
+geometries = {}
+
+
+def getGeometry(size):
+    # Only allow boards whose size is a perfect square
+    if size not in geometries:
+        sub = isqrt(size)
+        if sub < 2 or sub * sub != size or size > len(symbols):
+            raise ValueError("Unsupported board size: " + str(size))
+        geometries[size] = Geometry(sub)
+    return geometries[size]
+
+
+def geometryOf(puzzle):
+    # Read the geometry off the number of rows of the board
+    return getGeometry(len(puzzle))
+
+
 # Initialize variables
 board_size = 9
 sub_size = 3
+all_digits = (1 << board_size) - 1
+
+# Initialize lookup tables of the default board for the row, column, sub matrix, units and peers of every cell
+default_geometry = getGeometry(board_size)
+cell_row = default_geometry.cell_row
+cell_col = default_geometry.cell_col
+cell_sub = default_geometry.cell_sub
+units = default_geometry.units
+cell_units = default_geometry.cell_units
+peers = default_geometry.peers
+
+
+class Board:
+    # Keep every board down to its geometry and one byte per cell
+    __slots__ = ("geometry", "cells")
+
+    def __init__(self, cells=None, size=board_size):
+        # Initialize an empty board or take over the flat row-major entries
+        self.geometry = getGeometry(size)
+        if cells is None:
+            self.cells = bytearray(self.geometry.total_cells)
+        else:
+            self.cells = bytearray(cells)
+            if len(self.cells) != self.geometry.total_cells:
+                raise ValueError("Expected " + str(self.geometry.total_cells) + " cells, got " + str(len(self.cells)))
+
+    @classmethod
+    def fromList(cls, puzzle):
+        # Flatten a nested-list board row by row
+        return cls([num for row in puzzle for num in row], size=len(puzzle))
+
+    def toList(self):
+        # Rebuild the nested-list board used by the rest of the code
+        size = self.geometry.board_size
+        return [list(self.cells[row:row + size]) for row in range(0, self.geometry.total_cells, size)]
+
+    def copy(self):
+        # Copy the board with a single buffer copy
+        board = Board.__new__(Board)
+        board.geometry = self.geometry
+        board.cells = self.cells[:]
+        return board
+
+    def __len__(self):
+        # Report the number of rows like a nested-list board
+        return self.geometry.board_size
+
+    def rowSlice(self, index):
+        # Find the cells of row x, counting negative rows from the end like a list
+        size = self.geometry.board_size
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("Row index out of range")
+        return slice(index * size, (index + 1) * size)
+
+    def __getitem__(self, index):
+        # Read a cell by (x, y), or return a writable view of row x
+        if isinstance(index, tuple):
+            return self.cells[index[0] * self.geometry.board_size + index[1]]
+        return memoryview(self.cells)[self.rowSlice(index)]
+
+    def __setitem__(self, index, value):
+        # Write a cell by (x, y), or replace row x with a sequence of entries
+        if isinstance(index, tuple):
+            self.cells[index[0] * self.geometry.board_size + index[1]] = value
+            return
+        row = self.rowSlice(index)
+        if len(value) != row.stop - row.start:
+            raise ValueError("Expected " + str(row.stop - row.start) + " entries for the row")
+        self.cells[row] = bytes(value)
+
+    def __iter__(self):
+        # Yield the rows so nested-list code can read the board directly
+        for row in range(self.geometry.board_size):
+            yield self[row]
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return self.cells == other.cells
+        return self.toList() == other
+
+    def isComplete(self):
+        # Check if every cell has been populated
+        return 0 not in self.cells
+
+    def isValid(self, cell, num):
+        # Check the number against the peers of the cell
+        cells = self.cells
+        for peer in self.geometry.peers[cell]:
+            if cells[peer] == num:
+                return False
+        return True
+
+
+class ConflictTracker:
+    def __init__(self, puzzle):
+        self.load(puzzle)
+
+    def load(self, puzzle):
+        # Count the digits of every unit once for the whole board
+        self.geometry = geometryOf(puzzle)
+        size = self.geometry.board_size
+        self.values = [0] * self.geometry.total_cells
+        self.counts = [[0] * (size + 1) for unit in self.geometry.units]
+        self.repeats = 0
+        self.filled = 0
+        for x in range(size):
+            for y in range(size):
+                self.set(x, y, puzzle[x][y])
+
+    def set(self, x, y, num):
+        # Move the cell from its old digit to the new one in each of its three units
+        cell = x * self.geometry.board_size + y
+        old = self.values[cell]
+        if old == num:
+            return
+        for unit in self.geometry.cell_units[cell]:
+            counts = self.counts[unit]
+            if old:
+                counts[old] -= 1
+                if counts[old] == 1:
+                    self.repeats -= 1
+            if num:
+                counts[num] += 1
+                if counts[num] == 2:
+                    self.repeats += 1
+        self.filled += (num != 0) - (old != 0)
+        self.values[cell] = num
+
+    def isConflicting(self, x, y):
+        # Check if the entry of the cell is repeated within any of its units
+        cell = x * self.geometry.board_size + y
+        num = self.values[cell]
+        return bool(num) and any(self.counts[unit][num] > 1 for unit in self.geometry.cell_units[cell])
+
+    def isSolved(self):
+        # Check if the board is full without any repeated entries
+        return self.filled == self.geometry.total_cells and not self.repeats
+
+
+# Initialize solved grids from separate families to seed the grid factory
+seed_grids = [
+    "123456789456789123789123456234567891567891234891234567345678912678912345912345678",
+    "249368715356971824781542639512783496874629153693154278967415382425837961138296547",
+    "152643978984217563637958241796421835321586794548379126465192387819734652273865419",
+    "834259167197468235256713498912384756543176829678925314429537681761892543385641972"]
+
+# Initialize the partner cell of each symmetry used when removing hints
+symmetries = {
+    "none": lambda x, y, size: (x, y),
+    "rotational": lambda x, y, size: (size - 1 - x, size - 1 - y),
+    "mirror": lambda x, y, size: (x, size - 1 - y),
+    "diagonal": lambda x, y, size: (y, x)}
+
+# Initialize the techniques used by the propagation engine
+techniques = ["Naked Single", "Hidden Single", "Naked Pair", "Naked Triple", "Pointing", "Claiming"]
 
 def printBoard(puzzle):
+    # Initialize the dimensions and the width of each entry
+    size = len(puzzle)
+    sub = isqrt(size)
+    width = len(str(size))
+
     # Print Readable Board On Terminal
     print()
-    for row in range(board_size):
-        if row != 0 and row % sub_size == 0:
-            print("- "*11)
-        for col in range(board_size):
-            if col in [3, 6]:
+    for row in range(size):
+        if row != 0 and row % sub == 0:
+            print("- "*((size * (width + 1) + (sub - 1) * 2) // 2))
+        for col in range(size):
+            if col != 0 and col % sub == 0:
                 print("|", end=' ')
-            print(puzzle[row][col], end=' ')
+            print(str(puzzle[row][col]).rjust(width), end=' ')
         print()
 
 
 def completeChecker(puzzle):
     # Check if the puzzle has been populated completely
-    for row in range(board_size):
-        if 0 in puzzle[row]:
+    for row in puzzle:
+        if 0 in row:
             return False
     return True
 
 
 def validityChecker(puzzle, x, y, num):
-    # Check the validity horizontally
-    if num in puzzle[x]:
-        return False
-    # Check the validity vertically
-    for row in range(board_size):
-        if num == puzzle[row][y]:
+    # Let compact boards check their own peers
+    if isinstance(puzzle, Board):
+        return puzzle.isValid(x * puzzle.geometry.board_size + y, num)
+    # Check the validity against the precomputed peers instead of solving for the sub matrix
+    geometry = geometryOf(puzzle)
+    for peer in geometry.peers[x * geometry.board_size + y]:
+        if num == puzzle[geometry.cell_row[peer]][geometry.cell_col[peer]]:
             return False
-    # Solve for the beginning of the sub matrix
-    sub_row = int(x - x % sub_size)
-    sub_col = int(y - y % sub_size)
-    # Check the validity within the sub matrix
-    for row in range(sub_size):
-        for col in range(sub_size):
-            if num == puzzle[sub_row + row][sub_col + col]:
-                return False
     return True
 
 
-def nextCoordinates(x, y):
+def nextCoordinates(x, y, size=board_size):
     # Check if out of bounds then iterate coordinates
-    if y == board_size-1:
+    if y == size-1:
         return x + 1, 0
     else:
         return x, y + 1
 
 
-def backtrack(puzzle, coordinates=(0, 0), moves=[]):
+def backtrack(puzzle, coordinates=(0, 0), moves=None):
+    # Initialize the moves list when none is passed
+    if moves is None:
+        moves = []
     # Split the coordinates to x and y
     x, y = coordinates
     # Set Base Case as the solved puzzle
@@ -62,31 +277,864 @@ def backtrack(puzzle, coordinates=(0, 0), moves=[]):
     else:
         # Trace possible numbers for the cell
         if puzzle[x][y] == 0:
-            for num in range(1, board_size+1):
+            # Count the valid numbers only when the moves are traced for stats
+            stats = getattr(moves, "stats", None)
+            choices = stats and sum(1 for num in range(1, len(puzzle)+1) if validityChecker(puzzle, x, y, num))
+            for num in range(1, len(puzzle)+1):
                 if validityChecker(puzzle, x, y, num):
                     # Try the valid number and update the moves list
                     puzzle[x][y] = num
+                    if stats:
+                        stats.enter(choices)
                     moves.append([x, y, num])
                     # Recurse backtrack while passing the next coordinates and the current moves list
                     solution = backtrack(
-                        puzzle, coordinates=nextCoordinates(x, y), moves=moves)
+                        puzzle, coordinates=nextCoordinates(x, y, len(puzzle)), moves=moves)
                     # Return the found solution board and update moves list
                     if solution["Solution"] != "Unsolvable":
                         return solution
                     # Reset the invalid and update the moves list
                     puzzle[x][y] = 0
                     moves.append([x, y, 0])
+                    if stats:
+                        stats.leave(choices)
             # Return false if the algorithm finds no possible number to enter
             return {"Solution": "Unsolvable", "Moves": [], "Skip": False} # False
         # Skip the cell when it is already filled
         else:
             solution = backtrack(
-                puzzle, coordinates=nextCoordinates(x, y), moves=moves
+                puzzle, coordinates=nextCoordinates(x, y, len(puzzle)), moves=moves
             )
             return solution
 
 
+def bitmaskBacktrack(puzzle, moves=None):
+    # Initialize the moves list when none is passed
+    if moves is None:
+        moves = []
+
+    # Initialize occupancy bitmasks for each row, column and sub matrix
+    geometry = geometryOf(puzzle)
+    rows = [0] * geometry.board_size
+    cols = [0] * geometry.board_size
+    subs = [0] * geometry.board_size
+    empty_cells = []
+
+    # Loop through the board and register each hint into the bitmasks
+    for x in range(geometry.board_size):
+        for y in range(geometry.board_size):
+            sub = geometry.cell_sub[x * geometry.board_size + y]
+            if puzzle[x][y]:
+                bit = 1 << (puzzle[x][y] - 1)
+                # Stop early when a hint is repeated within a row, column or sub matrix
+                if (rows[x] | cols[y] | subs[sub]) & bit:
+                    return {"Solution": "Unsolvable", "Moves": [], "Skip": False}
+                rows[x] |= bit
+                cols[y] |= bit
+                subs[sub] |= bit
+            else:
+                # Track the empty cells along with their sub matrix
+                empty_cells.append((x, y, sub))
+
+    # Search through the empty cells and return the solved board
+    if searchMasks(puzzle, rows, cols, subs, empty_cells, moves):
+        return {"Solution": puzzle, "Moves": moves, "Skip": False}
+    return {"Solution": "Unsolvable", "Moves": [], "Skip": False}
+
+
+def searchMasks(puzzle, rows, cols, subs, empty_cells, moves, randomize=False):
+    # Set Base Case as the board having no empty cells left
+    if not empty_cells:
+        return True
+
+    # Find the empty cell with the fewest candidates
+    all_digits = (1 << len(puzzle)) - 1
+    best_index, best_count, best_free = 0, len(puzzle) + 1, 0
+    for index, (x, y, sub) in enumerate(empty_cells):
+        free = all_digits & ~(rows[x] | cols[y] | subs[sub])
+        count = bin(free).count("1")
+        if count < best_count:
+            best_index, best_count, best_free = index, count, free
+            # Stop looking once a cell is forced or stuck
+            if count <= 1:
+                break
+
+    # Return false if the cell has no possible number to enter
+    if best_count == 0:
+        return False
+
+    # Take the chosen cell out of the empty cells
+    empty_cells[best_index], empty_cells[-1] = empty_cells[-1], empty_cells[best_index]
+    x, y, sub = empty_cells.pop()
+
+    # Trace each candidate for the cell from lowest to highest unless randomized
+    bits = []
+    while best_free:
+        bits.append(best_free & -best_free)
+        best_free ^= bits[-1]
+    if randomize:
+        shuffle(bits)
+    stats = getattr(moves, "stats", None)
+    for bit in bits:
+        num = bit.bit_length()
+
+        # Try the candidate and update the bitmasks and moves list
+        puzzle[x][y] = num
+        rows[x] |= bit
+        cols[y] |= bit
+        subs[sub] |= bit
+        if stats:
+            stats.enter(best_count)
+        moves.append([x, y, num])
+
+        # Recurse the search and return once the board is solved
+        if searchMasks(puzzle, rows, cols, subs, empty_cells, moves, randomize):
+            return True
+
+        # Reset the invalid candidate and update the moves list
+        rows[x] ^= bit
+        cols[y] ^= bit
+        subs[sub] ^= bit
+        puzzle[x][y] = 0
+        moves.append([x, y, 0])
+        if stats:
+            stats.leave(best_count)
+
+    # Put the cell back in its original place before backtracking
+    empty_cells.append((x, y, sub))
+    empty_cells[best_index], empty_cells[-1] = empty_cells[-1], empty_cells[best_index]
+    return False
+
+
+def solveSteps(puzzle):
+    # Initialize occupancy bitmasks for each row, column and sub matrix
+    geometry = geometryOf(puzzle)
+    size = geometry.board_size
+    rows = [0] * size
+    cols = [0] * size
+    subs = [0] * size
+    empty_cells = []
+
+    # Loop through the board and register each hint into the bitmasks
+    for x in range(size):
+        for y in range(size):
+            sub = geometry.cell_sub[x * size + y]
+            if puzzle[x][y]:
+                bit = 1 << (puzzle[x][y] - 1)
+                # Stop early when a hint is repeated within a row, column or sub matrix
+                if (rows[x] | cols[y] | subs[sub]) & bit:
+                    return False
+                rows[x] |= bit
+                cols[y] |= bit
+                subs[sub] |= bit
+            else:
+                empty_cells.append((x, y, sub))
+
+    # Keep the chosen cells on an explicit stack along with the candidates left to try
+    stack = []
+    while empty_cells:
+        # Find the empty cell with the fewest candidates
+        best_index, best_count, best_free = 0, size + 1, 0
+        for index, (x, y, sub) in enumerate(empty_cells):
+            free = geometry.all_digits & ~(rows[x] | cols[y] | subs[sub])
+            count = bin(free).count("1")
+            if count < best_count:
+                best_index, best_count, best_free = index, count, free
+                if count <= 1:
+                    break
+
+        # Take the chosen cell out of the empty cells unless it has no possible number
+        if best_count:
+            empty_cells[best_index], empty_cells[-1] = empty_cells[-1], empty_cells[best_index]
+            x, y, sub = empty_cells.pop()
+            stack.append([x, y, sub, best_index, best_free])
+
+        # Try the next candidate of the deepest cell, backing out of cells with none left
+        while stack:
+            frame = stack[-1]
+            x, y, sub, index, free = frame
+            # Reset the previous candidate of the cell and yield the move
+            if puzzle[x][y]:
+                bit = 1 << (puzzle[x][y] - 1)
+                rows[x] ^= bit
+                cols[y] ^= bit
+                subs[sub] ^= bit
+                puzzle[x][y] = 0
+                yield [x, y, 0]
+            # Try the lowest remaining candidate and yield the move
+            if free:
+                bit = free & -free
+                frame[4] = free ^ bit
+                rows[x] |= bit
+                cols[y] |= bit
+                subs[sub] |= bit
+                puzzle[x][y] = bit.bit_length()
+                yield [x, y, puzzle[x][y]]
+                break
+            # Put the cell back in its original place before backtracking
+            stack.pop()
+            empty_cells.append((x, y, sub))
+            empty_cells[index], empty_cells[-1] = empty_cells[-1], empty_cells[index]
+        else:
+            return False
+    return True
+
+
+class Propagator:
+    def __init__(self, puzzle=None, subsets=True, locked=True, moves=None, geometry=None):
+        # Initialize the placed values and candidate bitmasks of every cell
+        self.geometry = geometry or (geometryOf(puzzle) if puzzle is not None else default_geometry)
+        self.values = [0] * self.geometry.total_cells
+        self.candidates = [self.geometry.all_digits] * self.geometry.total_cells
+        self.eliminations = dict.fromkeys(techniques, 0)
+        self.placements = {"Naked Single": 0, "Hidden Single": 0}
+        self.subsets = subsets
+        self.locked = locked
+        self.moves = moves
+        self.error = None
+
+        # Initialize the work queue with every unit
+        self.queue = deque(range(len(self.geometry.units)))
+        self.queued = [True] * len(self.geometry.units)
+        self.singles = []
+
+        # Register the hints of the board
+        if puzzle is not None:
+            self.load(puzzle)
+
+    def load(self, puzzle):
+        geometry = self.geometry
+        # Place each hint while tracking the digits taken within every unit
+        taken = [0] * len(geometry.units)
+        for cell in range(geometry.total_cells):
+            num = puzzle[geometry.cell_row[cell]][geometry.cell_col[cell]]
+            if num:
+                bit = 1 << (num - 1)
+                for unit in geometry.cell_units[cell]:
+                    if taken[unit] & bit:
+                        self.error = "[!] " + str(num) + " was repeated across " + unitName(unit, geometry)
+                        return
+                    taken[unit] |= bit
+                self.values[cell] = num
+                self.candidates[cell] = bit
+
+        # Narrow down the candidates of every open cell in a single pass
+        for cell in range(geometry.total_cells):
+            if not self.values[cell]:
+                row, col, sub = geometry.cell_units[cell]
+                self.candidates[cell] = geometry.all_digits & ~(taken[row] | taken[col] | taken[sub])
+                if not self.candidates[cell]:
+                    self.error = "[!] Cell " + cellName(cell, geometry) + " has no possible entry"
+                    return
+                if not self.candidates[cell] & (self.candidates[cell] - 1):
+                    self.singles.append(cell)
+
+    def copy(self):
+        # Duplicate the state so a branch can continue from it
+        other = Propagator.__new__(Propagator)
+        other.geometry = self.geometry
+        other.values = self.values[:]
+        other.candidates = self.candidates[:]
+        other.eliminations = dict(self.eliminations)
+        other.placements = dict(self.placements)
+        other.subsets = self.subsets
+        other.locked = self.locked
+        other.moves = self.moves
+        other.error = self.error
+        other.queue = deque(self.queue)
+        other.queued = self.queued[:]
+        other.singles = self.singles[:]
+        return other
+
+    def enqueue(self, cell):
+        # Mark the units of a changed cell for another pass
+        for unit in self.geometry.cell_units[cell]:
+            if not self.queued[unit]:
+                self.queued[unit] = True
+                self.queue.append(unit)
+
+    def assign(self, cell, num, technique):
+        # Check that the entry is still possible for the cell
+        if self.values[cell]:
+            if self.values[cell] != num:
+                self.error = "[!] Cell " + cellName(cell, self.geometry) + " has conflicting entries"
+            return self.error is None
+        bit = 1 << (num - 1)
+        if not self.candidates[cell] & bit:
+            self.error = "[!] " + str(num) + " cannot be placed in cell " + cellName(cell, self.geometry)
+            return False
+
+        # Place the entry and update the moves list
+        self.values[cell] = num
+        self.candidates[cell] = bit
+        if technique is not None:
+            self.placements[technique] += 1
+            if self.moves is not None:
+                self.moves.append([self.geometry.cell_row[cell], self.geometry.cell_col[cell], num])
+
+        # Remove the entry from every peer
+        for peer in self.geometry.peers[cell]:
+            if self.candidates[peer] & bit and not self.eliminate(peer, bit, technique):
+                return False
+        self.enqueue(cell)
+        return True
+
+    def eliminate(self, cell, bits, technique):
+        # Remove the candidates and count them towards the technique
+        removed = self.candidates[cell] & bits
+        if not removed:
+            return True
+        self.candidates[cell] ^= removed
+        if technique is not None:
+            self.eliminations[technique] += bin(removed).count("1")
+
+        # Check whether the cell is left with one or no candidates
+        if not self.candidates[cell]:
+            self.error = "[!] Cell " + cellName(cell, self.geometry) + " has no possible entry"
+            return False
+        if not self.candidates[cell] & (self.candidates[cell] - 1):
+            self.singles.append(cell)
+        self.enqueue(cell)
+        return True
+
+    def propagate(self):
+        # Keep applying techniques until the queue runs dry or a contradiction is found
+        while self.error is None:
+            # Place naked singles first as they are the cheapest
+            if self.singles:
+                cell = self.singles.pop()
+                if not self.values[cell]:
+                    self.assign(cell, self.candidates[cell].bit_length(), "Naked Single")
+                continue
+            if not self.queue:
+                break
+
+            # Check the next changed unit
+            unit = self.queue.popleft()
+            self.queued[unit] = False
+            self.checkUnit(unit)
+        return self.error is None
+
+    def checkUnit(self, unit):
+        geometry = self.geometry
+        candidates = self.candidates
+        unit_cells = geometry.units[unit]
+        open_cells = [cell for cell in unit_cells if not self.values[cell]]
+
+        # Find the digits that appear once within the unit
+        once = twice = 0
+        for cell in unit_cells:
+            twice |= once & candidates[cell]
+            once |= candidates[cell]
+        if once != geometry.all_digits:
+            missing = (geometry.all_digits & ~once).bit_length()
+            self.error = "[!] " + str(missing) + " has no possible cell across " + unitName(unit, geometry)
+            return
+
+        # Place hidden singles
+        hidden = once & ~twice
+        for cell in open_cells:
+            if candidates[cell] & hidden:
+                if not self.assign(cell, (candidates[cell] & hidden).bit_length(), "Hidden Single"):
+                    return
+
+        # Look for naked pairs and triples among the remaining open cells
+        if self.subsets:
+            open_cells = [cell for cell in open_cells if not self.values[cell]]
+            for count, technique in ((2, "Naked Pair"), (3, "Naked Triple")):
+                small = [cell for cell in open_cells if bin(candidates[cell]).count("1") <= count]
+                for group in combinations(small, count):
+                    union = 0
+                    for cell in group:
+                        union |= candidates[cell]
+                    if bin(union).count("1") == count:
+                        for cell in open_cells:
+                            if cell not in group and not self.eliminate(cell, union, technique):
+                                return
+
+        # Look for digits locked into a single line or sub matrix
+        if not self.locked:
+            return
+        open_cells = [cell for cell in open_cells if not self.values[cell]]
+        cell_row, cell_col, cell_sub, size = geometry.cell_row, geometry.cell_col, geometry.cell_sub, geometry.board_size
+        remaining = 0
+        for cell in open_cells:
+            remaining |= candidates[cell]
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            spots = [cell for cell in open_cells if candidates[cell] & bit]
+            if unit >= 2 * size:
+                # Pointing removes the digit from the rest of the shared row or column
+                if all(cell_row[cell] == cell_row[spots[0]] for cell in spots):
+                    targets, technique = geometry.units[cell_row[spots[0]]], "Pointing"
+                elif all(cell_col[cell] == cell_col[spots[0]] for cell in spots):
+                    targets, technique = geometry.units[size + cell_col[spots[0]]], "Pointing"
+                else:
+                    continue
+            elif all(cell_sub[cell] == cell_sub[spots[0]] for cell in spots):
+                # Claiming removes the digit from the rest of the shared sub matrix
+                targets, technique = geometry.units[2 * size + cell_sub[spots[0]]], "Claiming"
+            else:
+                continue
+            for cell in targets:
+                if cell not in unit_cells and not self.values[cell] and not self.eliminate(cell, bit, technique):
+                    return
+
+    def fill(self, puzzle):
+        # Copy the placed values back into the board
+        for cell in range(self.geometry.total_cells):
+            puzzle[self.geometry.cell_row[cell]][self.geometry.cell_col[cell]] = self.values[cell]
+        return puzzle
+
+
+def unitName(unit, geometry=default_geometry):
+    # Describe a unit the same way as the board validation messages
+    size = geometry.board_size
+    if unit < size:
+        return "row " + str(unit)
+    elif unit < 2 * size:
+        return "column " + str(unit - size)
+    sub = unit - 2 * size
+    return "sub matrix (" + str(sub // geometry.sub_size) + ", " + str(sub % geometry.sub_size) + ")"
+
+
+def cellName(cell, geometry=default_geometry):
+    # Describe a cell by its coordinates
+    return "(" + str(geometry.cell_row[cell]) + ", " + str(geometry.cell_col[cell]) + ")"
+
+
+def propagate(puzzle, moves=None, subsets=True, locked=True):
+    # Run every technique over the board and fill in the placed entries
+    state = Propagator(puzzle, subsets=subsets, locked=locked, moves=moves)
+    state.propagate()
+    if state.error is None:
+        state.fill(puzzle)
+    return {"Puzzle": puzzle, "Eliminations": state.eliminations, "Error": state.error}
+
+
+def countSolutions(puzzle, limit=2):
+    # Register the hints and stop early when they already clash
+    state = Propagator(puzzle, subsets=False, locked=False)
+    if state.error:
+        return 0
+    return countStates(state, limit)
+
+
+def countStates(state, limit, solutions=None):
+    # Fill in the forced entries and stop when a contradiction is found
+    if not state.propagate():
+        return 0
+
+    # Find the open cell with the fewest candidates
+    best, best_count = None, state.geometry.board_size + 1
+    for cell in range(state.geometry.total_cells):
+        if not state.values[cell]:
+            count = bin(state.candidates[cell]).count("1")
+            if count < best_count:
+                best, best_count = cell, count
+                if count == 2:
+                    break
+
+    # Set Base Case as the board being completely filled
+    if best is None:
+        if solutions is not None:
+            solutions.append(state.values[:])
+        return 1
+
+    # Branch on each candidate, reusing the current state for the last one
+    total = 0
+    free = state.candidates[best]
+    while free and total < limit:
+        bit = free & -free
+        free ^= bit
+        branch = state.copy() if free else state
+        if branch.assign(best, bit.bit_length(), None):
+            total += countStates(branch, limit - total, solutions)
+    return total
+
+
+def findOtherSolution(puzzle, solution, cells):
+    # Look for a solution that differs from the known one on at least one of the cells
+    for index, cell in enumerate(cells):
+        state = Propagator(puzzle, subsets=False, locked=False)
+        # Keep the earlier cells as they are in the known solution
+        for other in cells[:index]:
+            state.assign(other, solution[other], None)
+        # Forbid the known entry of the current cell
+        state.eliminate(cell, 1 << (solution[cell] - 1), None)
+        found = []
+        if state.error is None and countStates(state, 1, found):
+            return found[0]
+    return None
+
+
+def searchStates(state, moves):
+    # Fill in the forced entries and stop when a contradiction is found
+    if not state.propagate():
+        return None
+
+    # Find the open cell with the fewest candidates
+    best, best_count = None, state.geometry.board_size + 1
+    for cell in range(state.geometry.total_cells):
+        if not state.values[cell]:
+            count = bin(state.candidates[cell]).count("1")
+            if count < best_count:
+                best, best_count = cell, count
+                if count == 2:
+                    break
+
+    # Set Base Case as the board being completely filled
+    if best is None:
+        return state
+
+    # Try each candidate on a copy of the state
+    x, y = state.geometry.cell_row[best], state.geometry.cell_col[best]
+    free = state.candidates[best]
+    stats = getattr(moves, "stats", None)
+    while free:
+        bit = free & -free
+        free ^= bit
+        branch = state.copy()
+        if stats:
+            stats.enter(best_count)
+        moves.append([x, y, bit.bit_length()])
+        if branch.assign(best, bit.bit_length(), None):
+            solved = searchStates(branch, moves)
+            if solved is not None:
+                return solved
+
+        # Reset every entry the branch placed and update the moves list
+        for cell in range(state.geometry.total_cells):
+            if branch.values[cell] and not state.values[cell]:
+                moves.append([state.geometry.cell_row[cell], state.geometry.cell_col[cell], 0])
+        if not branch.values[best]:
+            moves.append([x, y, 0])
+        if stats:
+            stats.leave(best_count)
+    return None
+
+
+def propagationSolve(puzzle, moves=None):
+    # Initialize the moves list when none is passed
+    if moves is None:
+        moves = []
+
+    # Search with hidden singles and locked candidates at every step
+    state = Propagator(puzzle, subsets=False, moves=moves)
+    solved = searchStates(state, moves) if state.error is None else None
+    if solved is None:
+        return {"Solution": "Unsolvable", "Moves": [], "Skip": False}
+    return {"Solution": solved.fill(puzzle), "Moves": moves, "Skip": False}
+
+
+class DancingLinks:
+    def __init__(self, geometry=default_geometry):
+        # Initialize the 4 constraint groups of columns (cell, row-digit, column-digit, sub matrix-digit)
+        self.geometry = geometry
+        self.columns = 4 * geometry.total_cells
+        columns = self.columns
+        size = geometry.board_size
+
+        # Initialize the root and column headers as a circular doubly linked list
+        self.left = [col - 1 for col in range(columns + 1)]
+        self.right = [col + 1 for col in range(columns + 1)]
+        self.left[0] = columns
+        self.right[columns] = 0
+        self.up = list(range(columns + 1))
+        self.down = list(range(columns + 1))
+        self.header = list(range(columns + 1))
+        self.size = [0] * (columns + 1)
+        self.candidate = [None] * (columns + 1)
+        self.first_node = []
+
+        # Create a row of 4 linked nodes for every possible entry of every cell
+        for x in range(size):
+            for y in range(size):
+                sub = geometry.cell_sub[x * size + y]
+                for num in range(1, size + 1):
+                    self.addRow((x, y, num), (
+                        1 + x * size + y,
+                        1 + size * size + x * size + num - 1,
+                        1 + 2 * size * size + y * size + num - 1,
+                        1 + 3 * size * size + sub * size + num - 1))
+
+    def addRow(self, candidate, columns):
+        # Link each new node horizontally and append it at the bottom of its column
+        first = len(self.header)
+        self.first_node.append(first)
+        for index, col in enumerate(columns):
+            node = first + index
+            self.left.append(first + (index - 1) % len(columns))
+            self.right.append(first + (index + 1) % len(columns))
+            self.up.append(self.up[col])
+            self.down.append(col)
+            self.down[self.up[col]] = node
+            self.up[col] = node
+            self.header.append(col)
+            self.candidate.append(candidate)
+            self.size[col] += 1
+
+    def cover(self, col):
+        left, right, up, down, header, size = self.left, self.right, self.up, self.down, self.header, self.size
+        # Unlink the column header then every row that uses the column
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        row = down[col]
+        while row != col:
+            node = right[row]
+            while node != row:
+                down[up[node]] = down[node]
+                up[down[node]] = up[node]
+                size[header[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def uncover(self, col):
+        left, right, up, down, header, size = self.left, self.right, self.up, self.down, self.header, self.size
+        # Relink everything in the exact reverse order it was covered
+        row = up[col]
+        while row != col:
+            node = left[row]
+            while node != row:
+                size[header[node]] += 1
+                down[up[node]] = node
+                up[down[node]] = node
+                node = left[node]
+            row = up[row]
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def search(self, solution, moves):
+        right, down, size = self.right, self.down, self.size
+        # Set Base Case as every constraint column being covered
+        if right[0] == 0:
+            return True
+
+        # Choose the column with the fewest remaining rows
+        best = col = right[0]
+        while col != 0:
+            if size[col] < size[best]:
+                best = col
+                if size[col] <= 1:
+                    break
+            col = right[col]
+        if size[best] == 0:
+            return False
+
+        # Try each row of the chosen column
+        found = False
+        choices = size[best]
+        stats = getattr(moves, "stats", None)
+        self.cover(best)
+        row = down[best]
+        while row != best:
+            # Select the row and update the moves list
+            x, y, num = self.candidate[row]
+            solution.append(row)
+            if stats:
+                stats.enter(choices)
+            moves.append([x, y, num])
+            self.selectRow(row)
+
+            # Recurse the search then restore the links regardless of the result
+            found = self.search(solution, moves)
+            self.deselectRow(row)
+            if found:
+                break
+
+            # Reset the invalid row and update the moves list
+            solution.pop()
+            moves.append([x, y, 0])
+            if stats:
+                stats.leave(choices)
+            row = down[row]
+        self.uncover(best)
+        return found
+
+    def selectRow(self, row):
+        # Cover the other columns satisfied by the row
+        node = self.right[row]
+        while node != row:
+            self.cover(self.header[node])
+            node = self.right[node]
+
+    def deselectRow(self, row):
+        # Uncover the other columns satisfied by the row in reverse order
+        node = self.left[row]
+        while node != row:
+            self.uncover(self.header[node])
+            node = self.left[node]
+
+    def solve(self, puzzle, moves=None):
+        # Initialize the moves list when none is passed
+        if moves is None:
+            moves = []
+
+        # Cover the rows of each hint, stopping when a hint clashes with another
+        size = self.geometry.board_size
+        hints = []
+        solution = []
+        valid = True
+        for x in range(size):
+            for y in range(size):
+                if puzzle[x][y]:
+                    row = self.first_node[(x * size + y) * size + puzzle[x][y] - 1]
+                    if not all(self.right[self.left[self.header[row + i]]] == self.header[row + i] for i in range(4)):
+                        valid = False
+                        break
+                    self.cover(self.header[row])
+                    self.selectRow(row)
+                    hints.append(row)
+            if not valid:
+                break
+
+        # Search for the rest of the board while the links are reduced by the hints
+        found = valid and self.search(solution, moves)
+
+        # Restore the links so the structure can be reused for the next puzzle
+        for row in reversed(hints):
+            self.deselectRow(row)
+            self.uncover(self.header[row])
+
+        # Fill in the board using the selected rows
+        if not found:
+            return {"Solution": "Unsolvable", "Moves": [], "Skip": False}
+        for row in solution:
+            x, y, num = self.candidate[row]
+            puzzle[x][y] = num
+        return {"Solution": puzzle, "Moves": moves, "Skip": False}
+
+
+# Initialize the shared Dancing Links structure of each board size once it is first needed
+dancing_links = {}
+
+
+def dlxSolve(puzzle, moves=None):
+    # Build the Dancing Links structure only on the first call for the board size
+    if len(puzzle) not in dancing_links:
+        dancing_links[len(puzzle)] = DancingLinks(geometryOf(puzzle))
+    return dancing_links[len(puzzle)].solve(puzzle, moves)
+
+
+# Map each engine name to its solver
+engines = {"backtrack": backtrack, "bitmask": bitmaskBacktrack, "dlx": dlxSolve, "propagation": propagationSolve}
+
+
+class SolveStats:
+    def __init__(self, hooks=None):
+        # Initialize the search counters and the eliminations of the propagation phase
+        self.nodes = 0
+        self.dead_ends = 0
+        self.depth = 0
+        self.max_depth = 0
+        self.forced = 0
+        self.eliminations = dict.fromkeys(techniques, 0)
+        self.valid = None
+
+        # Initialize the wall time spent in each phase in seconds
+        self.timings = {"Propagation": 0.0, "Search": 0.0, "Validation": 0.0}
+
+        # Initialize the callables traced with every decision as hook(x, y, num, depth)
+        self.hooks = list(hooks) if hooks else []
+
+    def enter(self, choices):
+        # Count a candidate the search tries as a node, going a level deeper when it was chosen among others
+        self.nodes += 1
+        if choices > 1:
+            self.depth += 1
+            if self.depth > self.max_depth:
+                self.max_depth = self.depth
+
+    def leave(self, choices):
+        # Count a chosen candidate that failed as a dead end and go back a level
+        if choices > 1:
+            self.dead_ends += 1
+            self.depth -= 1
+
+    def record(self, x, y, num):
+        # Trace every move with the number of decisions leading to it
+        for hook in self.hooks:
+            hook(x, y, num, self.depth)
+
+    def report(self):
+        return {"Nodes": self.nodes, "Dead Ends": self.dead_ends, "Max Depth": self.max_depth,
+                "Forced": self.forced, "Eliminations": dict(self.eliminations),
+                "Timings": dict(self.timings), "Valid": self.valid}
+
+
+class TracedMoves(list):
+    def __init__(self, stats, moves=()):
+        # Start from the moves made so far and report every later one to the stats, which the engines also tell
+        # about each candidate they try
+        super().__init__(moves)
+        self.stats = stats
+
+    def append(self, move):
+        list.append(self, move)
+        self.stats.record(*move)
+
+
+def solve(puzzle, engine=None, moves=None, propagation=True, stats=None):
+    # Default to the bitmask engine on 9x9 boards and to propagating search on larger ones
+    if engine is None:
+        engine = "bitmask" if len(puzzle) <= board_size else "propagation"
+    # Check that the engine is supported
+    if engine not in engines:
+        raise ValueError("Unknown solver engine: " + str(engine))
+    if moves is None:
+        moves = []
+
+    # Hand instrumented solves over so the plain path stays untouched
+    if stats is not None:
+        return instrumentedSolve(puzzle, engine, moves, propagation, SolveStats() if stats is True else stats)
+
+    # Fill in every logically forced entry before searching
+    if propagation and propagate(puzzle, moves=moves)["Error"]:
+        return {"Solution": "Unsolvable", "Moves": [], "Skip": False}
+
+    # Solve the rest of the puzzle with the chosen engine
+    return engines[engine](puzzle, moves=moves)
+
+
+def instrumentedSolve(puzzle, engine, moves, propagation, stats):
+    # Time the propagation phase and register its eliminations and forced entries
+    start = time.perf_counter()
+    error = None
+    if propagation:
+        forced = len(moves)
+        result = propagate(puzzle, moves=moves)
+        error = result["Error"]
+        for technique, count in result["Eliminations"].items():
+            stats.eliminations[technique] = stats.eliminations.get(technique, 0) + count
+        stats.forced += len(moves) - forced
+    stats.timings["Propagation"] += time.perf_counter() - start
+    if error:
+        stats.valid = False
+        return {"Solution": "Unsolvable", "Moves": [], "Skip": False, "Stats": stats}
+
+    # Time the search while tracing each of its moves, then copy them over to the moves list
+    start = time.perf_counter()
+    traced = TracedMoves(stats, moves)
+    result = engines[engine](puzzle, moves=traced)
+    stats.timings["Search"] += time.perf_counter() - start
+    moves.extend(traced[len(moves):])
+    if result["Moves"] is traced:
+        result["Moves"] = moves
+
+    # Time the check of the solution
+    start = time.perf_counter()
+    stats.valid = result["Solution"] != "Unsolvable" and completeChecker(result["Solution"]) and not boardValidation(result["Solution"])
+    stats.timings["Validation"] += time.perf_counter() - start
+    result["Stats"] = stats
+    return result
+
+
 def boardValidation(puzzle):
+    # Initialize the dimensions of the board
+    board_size = len(puzzle)
+    sub_size = isqrt(board_size)
+
     # Initialize variables for tracking
     check_col = []
     check_sub = []
@@ -113,10 +1161,13 @@ def boardValidation(puzzle):
                 # Reset Tracker
                 check_sub = []
 
+        # Track the row as a list so compact boards can be counted too
+        check_row = list(puzzle[x])
+
         # Loop through all possible entries for counting
         for num in range(1, board_size+1):
             # Check rows
-            if puzzle[x].count(num) > 1:
+            if check_row.count(num) > 1:
                 return "[!] " + str(num) + " was repeated across row " + str(x)
 
             # Check columns
@@ -127,104 +1178,261 @@ def boardValidation(puzzle):
         check_col = []
 
 
-def generatePuzzle():
-    # Initialize a blank slate
-    puzzle = [[0 for col in range(board_size)]
-              for row in range(board_size)]
-
-    # Crawl through each sub matrix
-    for row in range(sub_size):
-        for col in range(sub_size):
-            # Randomize coordinates
-            x = randint(0, 2) * 3
-            y = randint(0, 2) * 3
-            # Initialize possible moves and shuffle it
-            possible = [val for val in range(1, board_size+1)]
-            shuffle(possible)
-            # Keep looping until a possibile entry is found
-            while possible:
-                # Choose one from the list and remove it from the possibility list
-                num = possible.pop()
-                # Update the puzzle when it is a valid move
-                if validityChecker(puzzle, row + x, col + y, num):
-                    puzzle[row + x][col + y] = num
-    
-    # Solve the template puzzle
-    puzzle = backtrack(puzzle, moves=[])["Solution"]
+def transformGrid(grid):
+    # Initialize the dimensions of the grid
+    board_size = len(grid)
+    sub_size = isqrt(board_size)
+
+    # Shuffle the rows within each band, then the bands themselves
+    bands = list(range(sub_size))
+    shuffle(bands)
+    rows = []
+    for band in bands:
+        lines = [band * sub_size + line for line in range(sub_size)]
+        shuffle(lines)
+        rows += lines
+
+    # Shuffle the columns within each stack, then the stacks themselves
+    stacks = list(range(sub_size))
+    shuffle(stacks)
+    cols = []
+    for stack in stacks:
+        lines = [stack * sub_size + line for line in range(sub_size)]
+        shuffle(lines)
+        cols += lines
+
+    # Relabel the digits and rebuild the grid with the shuffled lines
+    labels = [num for num in range(1, board_size + 1)]
+    shuffle(labels)
+    labels = [0] + labels
+    new_grid = [[labels[grid[x][y]] for y in cols] for x in rows]
+
+    # Randomly transpose then rotate the grid by quarter turns
+    if random() < 0.5:
+        new_grid = [list(line) for line in zip(*new_grid)]
+    for turn in range(randint(0, 3)):
+        new_grid = [list(line) for line in zip(*new_grid[::-1])]
+    return new_grid
+
+
+def gridFactory(seeds=None, size=board_size):
+    # Convert the seeds into boards once, falling back to the pattern grid on other sizes
+    if seeds is None:
+        seeds = seed_grids if size == board_size else [getGeometry(size).seed_grid]
+    boards = [parsePuzzle(seed) if isinstance(seed, str) else seed for seed in seeds]
+
+    # Keep yielding shuffled copies of a random seed
+    while True:
+        yield transformGrid(boards[randint(0, len(boards) - 1)])
+
+
+# Initialize the shared grid factory of each board size once it is first needed
+grid_factories = {}
+
+
+def randomGrid(search=False, size=board_size):
+    # Draw from the seed families unless grids outside their orbits should be reachable
+    if not search:
+        if size not in grid_factories:
+            grid_factories[size] = gridFactory(size=size)
+        return next(grid_factories[size])
+
+    # Fill a blank slate by searching the candidates in random order, which can reach every grid but favors some over
+    # others since each dead end shifts the odds toward the branches that fill quickly, so it is not a uniform sample
+    geometry = getGeometry(size)
+    puzzle = [[0 for col in range(size)] for row in range(size)]
+    empty_cells = [(x, y, geometry.cell_sub[x * size + y]) for x in range(size) for y in range(size)]
+    shuffle(empty_cells)
+    searchMasks(puzzle, [0] * size, [0] * size, [0] * size, empty_cells, [], randomize=True)
+    return puzzle
+
+
+def digHoles(grid, removal=None, symmetry="none", minimal=False):
+    # Initialize the puzzle and its solution as flat lists
+    geometry = geometryOf(grid)
+    size, cell_row, cell_col = geometry.board_size, geometry.cell_row, geometry.cell_col
+    puzzle = [line[:] for line in grid]
+    solution = [grid[cell_row[cell]][cell_col[cell]] for cell in range(geometry.total_cells)]
+
+    # Group the cells that are removed together and shuffle the groups
+    groups = []
+    for cell in range(geometry.total_cells):
+        x, y = symmetries[symmetry](cell_row[cell], cell_col[cell], size)
+        partner = x * size + y
+        if cell <= partner:
+            groups.append(sorted({cell, partner}))
+    shuffle(groups)
+
+    # Track the empty cells and every other solution found as bitmasks of cells
+    empty = 0
+    witnesses = []
+
+    # Try each group once, as a clue that cannot be removed never becomes removable later
+    for group in groups:
+        if not minimal and removal is not None and removal <= 0:
+            break
+        cells = 0
+        for cell in group:
+            cells |= 1 << cell
+
+        # Skip the search when a previous solution still fits the puzzle without the group
+        if any(not witness & ~(empty | cells) for witness in witnesses):
+            continue
+
+        # Only keep the removal when no other solution appears
+        for cell in group:
+            puzzle[cell_row[cell]][cell_col[cell]] = 0
+        other = findOtherSolution(puzzle, solution, group)
+        if other is None:
+            empty |= cells
+            if removal is not None:
+                removal -= len(group)
+        else:
+            # Restore the group and remember where the other solution differs
+            for cell in group:
+                puzzle[cell_row[cell]][cell_col[cell]] = solution[cell]
+            difference = 0
+            for cell in range(geometry.total_cells):
+                if other[cell] != solution[cell]:
+                    difference |= 1 << cell
+            witnesses.append(difference)
+
+    # Return the generated puzzle
+    return puzzle
+
+
+def generatePuzzle(symmetry="none", minimal=False, size=board_size):
+    # Draw a shuffled solved grid
+    puzzle = randomGrid(size=size)
 
     # Initialzie variable for total cells
-    total_cells = board_size * board_size 
+    total_cells = size * size
     # Randomize the difficulty
     relative_difficulty = random()
+    # Keep at least half of the hints on larger boards so the uniqueness checks stay quick
+    if size != board_size:
+        removal = total_cells - randint(int(total_cells*0.50), int(total_cells*0.55))
     # Set a 20% chance for the puzzle to have less hints than average
-    if relative_difficulty > 0.2:
+    elif relative_difficulty > 0.2:
         removal = total_cells - randint(int(total_cells*0.45), int(total_cells*0.55))
     else:
         removal = total_cells - randint(int(total_cells*0.30), int(total_cells*0.35))
-    # Remove a number of entries within the puzzle
-    for i in range(removal):
-        while True:
-            # Randomize coordinates
-            x = randint(0, 8)
-            y = randint(0, 8)
-            # Only stop when a non-zero entry is found
-            if puzzle[x][y] != 0:
-                puzzle[x][y] = 0
-                break
-    # Return the generated puzzle
-    return puzzle
+    # Remove a number of entries within the puzzle while keeping a single solution
+    return digHoles(puzzle, removal, symmetry, minimal)
 
 
 def solvabilityChecker(puzzle):
-    # Initialize a blank slate
-    invalid_moves = [[[] for col in range(board_size)]
-              for row in range(board_size)]
+    # Check for repeated entries before propagating
+    result = boardValidation(puzzle)
+    if result:
+        return result
 
-    # Loop through the board and find each hint
-    for x in range(board_size):
-        for y in range(board_size):
-            if puzzle[x][y]:
-                # Check rows and columns
-                for line in range(board_size):
-                    # Update invalid moves for the rows
-                    if not puzzle[line][y] and puzzle[x][y] not in invalid_moves[line][y]:
-                        invalid_moves[line][y].append(puzzle[x][y])
-                        # If the valid moves are reduced to one, update the puzzle and recurse the algorithm
-                        if len(invalid_moves[line][y]) == 8:
-                            for i in range(1, board_size+1): 
-                                if i not in invalid_moves[line][y]:
-                                    puzzle[line][y] = i
-                                    break
-                            return solvabilityChecker(puzzle)
-
-                    # Update invalid moves for the columns
-                    if not puzzle[x][line] and puzzle[x][y] not in invalid_moves[x][line]:
-                        invalid_moves[x][line].append(puzzle[x][y])
-                        # If the valid moves are reduced to one, update the puzzle and recurse the algorithm
-                        if len(invalid_moves[x][line]) == 8:
-                            for i in range(1, board_size+1): 
-                                if i not in invalid_moves[x][line]:
-                                    puzzle[x][line] = i
-                                    break
-                            return solvabilityChecker(puzzle)
-
-                # Calculate start of each sub matrix
-                sub_row = x - x % sub_size
-                sub_col = y - y % sub_size
-
-                # loop through each cell in the sub matrix of the current entry
-                for row in range(sub_size):
-                    for col in range(sub_size):
-                        # Update invalid moves for the sub matrix
-                        if not puzzle[sub_row + row][sub_col + col] and puzzle[x][y] not in invalid_moves[sub_row + row][sub_col + col]:
-                            invalid_moves[sub_row + row][sub_col + col].append(puzzle[x][y])
-                            # If the valid moves are reduced to one, update the puzzle and recurse the algorithm
-                            if len(invalid_moves[sub_row + row][sub_col + col]) == 8:
-                                for i in range(1, board_size+1): 
-                                    if i not in invalid_moves[sub_row + row][sub_col + col]:
-                                        puzzle[sub_row + row][sub_col + col] = i
-                                        break
-                                return solvabilityChecker(puzzle)
+    # Fill in every forced entry and report any contradiction found along the way
+    result = propagate(puzzle)["Error"]
+    if result:
+        return result
 
     # Finally, if everything seems correct, check validity of the puzzle
     return boardValidation(puzzle)
+
+
+def parsePuzzle(line):
+    # Read the board size off the line length, treating 0 and . as empty cells
+    line = line.strip()
+    size = isqrt(len(line))
+    sub = isqrt(size)
+    if size * size != len(line) or sub < 2 or sub * sub != size or size > len(symbols):
+        return None
+    entries = ".0" + symbols[:size]
+    if any(char not in entries for char in line):
+        return None
+    return [[max(entries.index(line[x * size + y]) - 1, 0) for y in range(size)] for x in range(size)]
+
+
+def formatPuzzle(puzzle):
+    # Convert a board back into a single line
+    return "".join(symbols[num - 1] if num else "0" for row in puzzle for num in row)
+
+
+def solveLines(lines, engine=None, cache_path=None):
+    # Solve through the solution cache of the process when a store is given
+    solver = lambda puzzle: solve(puzzle, engine=engine)
+    if cache_path:
+        # Import the cache lazily since it builds on this module
+        import cache
+        solver = cache.getCache(cache_path, engine=engine).solve
+
+    # Solve each line of a chunk and report errors in place of the solution
+    results = []
+    for line in lines:
+        puzzle = parsePuzzle(line)
+        if puzzle is None:
+            results.append("[!] Invalid puzzle line")
+            continue
+        result = boardValidation(puzzle)
+        if not result:
+            solution = solver(puzzle)["Solution"]
+            result = "[!] Unsolvable" if solution == "Unsolvable" else formatPuzzle(solution)
+        results.append(result)
+    if cache_path:
+        cache.getCache(cache_path, engine=engine).commit()
+    return results
+
+
+def batchSolve(lines, engine=None, processes=None, chunksize=256, window=None, cache_path=None):
+    # Limit the number of chunks in flight so memory stays flat on long inputs
+    processes = processes or cpu_count()
+    window = window or processes * 4
+    lines = (line for line in lines if line.strip())
+
+    with Pool(processes) as pool:
+        pending = deque()
+        while True:
+            # Hand the next chunk to the pool
+            chunk = list(islice(lines, chunksize))
+            if chunk:
+                pending.append(pool.apply_async(solveLines, (chunk, engine, cache_path)))
+
+            # Yield the oldest chunk in input order once the window is full or the input ran out
+            while pending and (len(pending) >= window or not chunk):
+                for result in pending.popleft().get():
+                    yield result
+            if not chunk:
+                break
+
+
+def main(argv=None):
+    # Parse the command line options
+    parser = argparse.ArgumentParser(description="Solve puzzles given one per line, such as 81 character lines for 9x9 boards.")
+    parser.add_argument("input", nargs="?", default="-", help="file with one puzzle per line (default: stdin)")
+    parser.add_argument("--engine", default=None, choices=sorted(engines), help="solver engine (default: by board size)")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--chunksize", type=int, default=256, help="puzzles per chunk")
+    parser.add_argument("--window", type=int, default=None, help="chunks in flight at once")
+    parser.add_argument("--cache", default=None, help="SQLite file caching solutions across runs")
+    args = parser.parse_args(argv)
+
+    # Stream the solutions to stdout while reporting progress to stderr
+    source = sys.stdin if args.input == "-" else open(args.input)
+    start = last_report = time.perf_counter()
+    solved = 0
+    try:
+        for result in batchSolve(source, args.engine, args.processes, args.chunksize, args.window, args.cache):
+            sys.stdout.write(result + "\n")
+            solved += 1
+            now = time.perf_counter()
+            if now - last_report >= 1:
+                last_report = now
+                sys.stderr.write("\rSolved {} puzzles ({:.0f} puzzles/s)".format(solved, solved / (now - start)))
+                sys.stderr.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    # Report the final throughput
+    elapsed = time.perf_counter() - start
+    sys.stderr.write("\rSolved {} puzzles in {:.2f}s ({:.0f} puzzles/s)\n".format(solved, elapsed, solved / elapsed if elapsed else 0))
+
+
+if __name__ == "__main__":
+    main()
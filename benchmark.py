@@ -0,0 +1,243 @@
+# Import necessary libraries
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+# Import Created Libraries
+import algorithm as algo
+
+# Initialize the path of the puzzle corpus bundled next to this file
+corpus_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_corpus.txt")
+
+# Initialize the tiers the legacy row-major backtracking can finish in reasonable time
+quick_tiers = ("easy", "medium", "hard")
+
+# Initialize the smallest change in latency, in milliseconds, worth flagging over timer noise
+noise_floor = 0.1
+
+# Initialize the number of times a flagged case is run again before it counts as a regression
+confirm_runs = 3
+
+
+def loadCorpus(path=corpus_path):
+    # Read the "tier puzzle" pairs into a list of puzzles per tier, skipping comments
+    corpus = {}
+    with open(path) as source:
+        for line in source:
+            if line.strip() and not line.startswith("#"):
+                tier, puzzle = line.split()
+                corpus.setdefault(tier, []).append(algo.parsePuzzle(puzzle))
+    return corpus
+
+
+def countNodes(moves):
+    # Count the placements the search made, leaving out the resets
+    return sum(1 for x, y, num in moves if num)
+
+
+def solveNodes(engine):
+    # Solve with the given engine and report the placements, which include those of the propagation pass
+    return lambda puzzle: countNodes(algo.solve(puzzle, engine=engine)["Moves"])
+
+
+def propagatedCells(puzzle):
+    # Count the entries the propagation pass of solve places before any search starts
+    board = [row[:] for row in puzzle]
+    if algo.propagate(board)["Error"]:
+        return 0
+    return sum(1 for x, row in enumerate(board) for y, num in enumerate(row) if num and not puzzle[x][y])
+
+
+# Initialize each benchmarked function with the tiers it runs on, a call returning its node count and
+# whether that count starts with the placements of the propagation pass, which are not search nodes
+cases = [
+    ("backtrack", quick_tiers, lambda puzzle: countNodes(algo.backtrack(puzzle)["Moves"]), False),
+    ("solve[bitmask]", None, solveNodes("bitmask"), True),
+    ("solve[dlx]", None, solveNodes("dlx"), True),
+    ("solve[propagation]", None, solveNodes("propagation"), True),
+    ("solveSteps", None, lambda puzzle: sum(1 for x, y, num in algo.solveSteps(puzzle) if num), False),
+    ("solvabilityChecker", None, lambda puzzle: algo.solvabilityChecker(puzzle) and None, False),
+    ("boardValidation", None, lambda puzzle: algo.boardValidation(puzzle) and None, False)]
+
+
+def percentile(values, fraction):
+    # Pick the nearest-rank percentile of the sorted values
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))]
+
+
+def summarize(timings, nodes):
+    # Report the latencies in milliseconds along with the throughput and mean nodes
+    total = sum(timings)
+    return {"Runs": len(timings),
+            "Mean": total / len(timings) * 1000,
+            "P50": percentile(timings, 0.5) * 1000,
+            "P90": percentile(timings, 0.9) * 1000,
+            "P99": percentile(timings, 0.99) * 1000,
+            "Max": max(timings) * 1000,
+            "Throughput": len(timings) / total if total else 0.0,
+            "Nodes": sum(nodes) / len(nodes) if nodes else None}
+
+
+def reference(rounds=3):
+    # Time a fixed workload that none of the benchmarked code touches, to tell how fast the machine runs right now
+    fastest = None
+    for run in range(rounds):
+        start = time.perf_counter()
+        table = {}
+        for index in range(20000):
+            table[index & 1023] = table.get(index & 1023, 0) + (index ^ (index >> 3))
+        elapsed = time.perf_counter() - start
+        fastest = elapsed if fastest is None else min(fastest, elapsed)
+    return fastest * 1000
+
+
+def runCase(function, puzzles, repeat, prepass=False):
+    # Time each call on a fresh copy of the puzzle, leaving the copy out of the timing
+    before = reference()
+    timings, nodes, fastest = [], [], {}
+    for run in range(repeat):
+        for index, puzzle in enumerate(puzzles):
+            board = [row[:] for row in puzzle]
+            start = time.perf_counter()
+            result = function(board)
+            elapsed = time.perf_counter() - start
+            timings.append(elapsed)
+            fastest[index] = min(fastest.get(index, elapsed), elapsed)
+            if result is not None:
+                # Leave the placements of the propagation pass out of the search nodes
+                nodes.append(result - propagatedCells(puzzle) if prepass else result)
+    summary = summarize(timings, nodes)
+
+    # Sum the fastest run of each puzzle, which scheduling and cache noise can only ever slow down
+    summary["Best"] = sum(fastest.values()) * 1000
+    summary["Reference"] = min(before, reference())
+    return summary
+
+
+def runGenerator(count, seed):
+    # Time the generator from a fixed seed so runs can be compared
+    random.seed(seed)
+    before = reference()
+    timings = []
+    for run in range(count):
+        start = time.perf_counter()
+        algo.generatePuzzle()
+        timings.append(time.perf_counter() - start)
+    summary = summarize(timings, [])
+    summary["Reference"] = min(before, reference())
+    return summary
+
+
+def runBenchmarks(corpus, repeat=5, generate=20, seed=0, only=None, keys=None):
+    # Run every case on each of its tiers, keyed as function/tier, or only the given keys
+    results = {}
+    for name, tiers, function, prepass in cases:
+        if only and only not in name:
+            continue
+        for tier in corpus:
+            if (tiers is None or tier in tiers) and (keys is None or name + "/" + tier in keys):
+                results[name + "/" + tier] = runCase(function, corpus[tier], repeat, prepass)
+    if generate and (not only or only in "generatePuzzle") and (keys is None or "generatePuzzle/generated" in keys):
+        results["generatePuzzle/generated"] = runGenerator(generate, seed)
+    return results
+
+
+def latencyMetric(result, baseline):
+    # Compare the best time over the tier, falling back to the median latency for cases without a fixed set of puzzles
+    return "Best" if "Best" in result and "Best" in baseline else "P50"
+
+
+def scaledLatency(result, baseline, metric):
+    # Scale the latency to the speed the machine ran the baseline at, going by the reference workload
+    if result.get("Reference") and baseline.get("Reference"):
+        return result[metric] * baseline["Reference"] / result["Reference"]
+    return result[metric]
+
+
+def findRegressions(results, baseline, threshold=0.2):
+    # Find every case whose node count or latency grew beyond the threshold as (key, metric, old, new)
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        latency = latencyMetric(result, baseline[key])
+        for metric in (latency, "Nodes"):
+            old = baseline[key].get(metric)
+            new = scaledLatency(result, baseline[key], metric) if metric == latency else result.get(metric)
+            if old and new is not None and new > old * (1 + threshold) and (metric == "Nodes" or new - old > noise_floor):
+                regressions.append((key, metric, old, new))
+    return regressions
+
+
+def compareResults(results, baseline, threshold=0.2):
+    # Describe each regression beyond the threshold
+    return ["[!] {} {} went from {:.3f} to {:.3f} (+{:.0%})".format(key, metric, old, new, new / old - 1)
+            for key, metric, old, new in findRegressions(results, baseline, threshold)]
+
+
+def confirmRegressions(results, baseline, corpus, repeat, generate, seed, threshold=0.2):
+    # Run the flagged cases again, keeping their fastest run, so a burst of load on the machine is not taken for a regression
+    for attempt in range(confirm_runs):
+        keys = set(key for key, metric, old, new in findRegressions(results, baseline, threshold) if metric != "Nodes")
+        if not keys:
+            break
+        for key, result in runBenchmarks(corpus, repeat, generate, seed, keys=keys).items():
+            metric = latencyMetric(result, baseline[key])
+            if scaledLatency(result, baseline[key], metric) < scaledLatency(results[key], baseline[key], metric):
+                results[key] = result
+    return compareResults(results, baseline, threshold)
+
+
+def printResults(results):
+    # Print a readable table of the results on the terminal
+    print("{:<36} {:>6} {:>9} {:>9} {:>9} {:>9} {:>9} {:>10} {:>10}".format(
+        "Case", "Runs", "Best ms", "P50 ms", "P90 ms", "P99 ms", "Max ms", "Per sec", "Nodes"))
+    for key, result in results.items():
+        nodes = "-" if result["Nodes"] is None else "{:.0f}".format(result["Nodes"])
+        best = "-" if "Best" not in result else "{:.3f}".format(result["Best"])
+        print("{:<36} {:>6} {:>9} {:>9.3f} {:>9.3f} {:>9.3f} {:>9.3f} {:>10.1f} {:>10}".format(
+            key, result["Runs"], best, result["P50"], result["P90"], result["P99"], result["Max"], result["Throughput"], nodes))
+
+
+def main(argv=None):
+    # Parse the command line options
+    parser = argparse.ArgumentParser(description="Benchmark the solvers, validators and generator on the bundled corpus.")
+    parser.add_argument("--corpus", default=corpus_path, help="file of \"tier puzzle\" lines")
+    parser.add_argument("--repeat", type=int, default=5, help="passes over the corpus per case")
+    parser.add_argument("--generate", type=int, default=20, help="puzzles to generate (0 to skip)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the generator")
+    parser.add_argument("--only", default=None, help="only run cases whose name contains this text")
+    parser.add_argument("--output", default=None, help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown flagged as a regression")
+    args = parser.parse_args(argv)
+
+    # Run the benchmarks and print them
+    corpus = loadCorpus(args.corpus)
+    results = runBenchmarks(corpus, args.repeat, args.generate, args.seed, args.only)
+    printResults(results)
+
+    # Save the results along with the interpreter they were measured on
+    if args.output:
+        with open(args.output, "w") as target:
+            json.dump({"Python": platform.python_version(), "Results": results}, target, indent=2)
+
+    # Compare against the baseline, confirming the slowdowns, and fail the run on regressions
+    if args.baseline:
+        with open(args.baseline) as source:
+            baseline = json.load(source)["Results"]
+        regressions = confirmRegressions(results, baseline, corpus, args.repeat, args.generate, args.seed, args.threshold)
+        for regression in regressions:
+            print(regression)
+        if regressions:
+            sys.exit(1)
+        print("No regressions beyond {:.0%}".format(args.threshold))
+
+
+if __name__ == "__main__":
+    main()
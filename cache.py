@@ -0,0 +1,249 @@
+# Import necessary libraries
+import sqlite3
+from collections import OrderedDict
+from itertools import permutations, product
+
+# Import Created Libraries
+import algorithm as algo
+
+# Initialize the column orders of each sub matrix size that keep the stacks intact
+column_orders = {}
+
+# Initialize the best column orders for the hint pattern of a first row
+leading_orders = {}
+
+# Initialize the number of tied transformations tracked before giving up on the canonical form
+candidate_limit = 20000
+
+# Initialize the caches opened by each process
+caches = {}
+
+
+def columnOrders(sub):
+    # Only enumerate stack and column permutations while there are few enough of them
+    if sub not in column_orders:
+        if sub > 3:
+            column_orders[sub] = [tuple(range(sub * sub))]
+        else:
+            column_orders[sub] = [tuple(stack * sub + inner[index][col] for index, stack in enumerate(stacks) for col in range(sub))
+                                  for stacks in permutations(range(sub))
+                                  for inner in product(permutations(range(sub)), repeat=sub)]
+    return column_orders[sub]
+
+
+def leadingOrders(sub, mask):
+    # Find the column orders pushing the hints of a first row furthest to the right
+    if (sub, mask) not in leading_orders:
+        size = sub * sub
+        patterns = [(sum(1 << (size - 1 - index) for index, col in enumerate(order) if mask >> col & 1), order)
+                    for order in columnOrders(sub)]
+        lowest = min(pattern for pattern, order in patterns)
+        leading_orders[(sub, mask)] = (lowest, [order for pattern, order in patterns if pattern == lowest])
+    return leading_orders[(sub, mask)]
+
+
+def canonicalForm(puzzle):
+    # Initialize the board and, on boards small enough to search fully, its transpose, so larger boards are only
+    # canonical under relabeling, row and band changes
+    geometry = algo.geometryOf(puzzle)
+    size, sub = geometry.board_size, geometry.sub_size
+    grids = [[list(row) for row in puzzle]]
+    if sub <= 3:
+        grids.append([list(col) for col in zip(*grids[0])])
+
+    # Start from the first rows whose hints can be pushed furthest to the right
+    firsts = dict(((grid, row), leadingOrders(sub, sum(1 << col for col in range(size) if grids[grid][row][col])))
+                  for grid in range(len(grids)) for row in range(size))
+    lowest = min(pattern for pattern, orders in firsts.values())
+
+    # Track every partial transformation that still gives the smallest board so far
+    candidates = []
+    for (grid, row), (pattern, orders) in firsts.items():
+        if pattern == lowest:
+            for order in orders:
+                # The distinct digits of the first row are labeled in order of appearance
+                labels = {}
+                for col in order:
+                    if grids[grid][row][col]:
+                        labels[grids[grid][row][col]] = len(labels) + 1
+                candidates.append((grid, (row,), order, labels))
+    grid, rows, order, labels = candidates[0]
+    canonical = [[labels[grids[grid][rows[0]][col]] if grids[grid][rows[0]][col] else 0 for col in order]]
+
+    for position in range(1, size):
+        best, survivors = None, []
+        for grid, rows, order, labels in candidates:
+            # Continue within the current band or open any band not used yet
+            if position % sub:
+                band = rows[-1] // sub
+                options = [row for row in range(band * sub, band * sub + sub) if row not in rows]
+            else:
+                used = set(row // sub for row in rows)
+                options = [row for row in range(size) if row // sub not in used]
+
+            for row in options:
+                # Read the row in the column order, relabeling digits by first appearance
+                values = grids[grid][row]
+                added = {}
+                line = []
+                smaller = best is None
+                for index, col in enumerate(order):
+                    num = values[col]
+                    if num:
+                        label = labels.get(num) or added.get(num)
+                        if label is None:
+                            label = added[num] = len(labels) + len(added) + 1
+                        num = label
+                    # Give up on the row as soon as it compares larger than the smallest one
+                    if not smaller:
+                        if num > best[index]:
+                            break
+                        smaller = num < best[index]
+                    line.append(num)
+                else:
+                    # Keep only the transformations giving the smallest row
+                    if smaller:
+                        best, survivors = line, []
+                    new_labels = dict(labels)
+                    new_labels.update(added)
+                    survivors.append((grid, rows + (row,), order, new_labels))
+        candidates = survivors
+        canonical.append(best)
+
+        # Fall back to the board as given when too many transformations tie, which is still a valid key but no longer
+        # shared by the equivalent puzzles, as happens on very sparse boards
+        if len(candidates) > candidate_limit:
+            return grids[0], (False, tuple(range(size)), tuple(range(size)), dict((num, num) for num in range(1, size + 1)))
+
+    # Give the digits missing from the board the remaining labels in order
+    grid, rows, order, labels = candidates[0]
+    missing = iter(num for num in range(1, size + 1) if num not in labels.values())
+    for num in range(1, size + 1):
+        if num not in labels:
+            labels[num] = next(missing)
+    return canonical, (grid == 1, rows, order, labels)
+
+
+def fromCanonical(board, transform):
+    # Undo the relabeling, the row and column orders and the transpose of a canonical board
+    transposed, rows, order, labels = transform
+    original = dict((label, num) for num, label in labels.items())
+    result = [[0] * len(board) for row in board]
+    for x, row in enumerate(rows):
+        for y, col in enumerate(order):
+            result[row][col] = original[board[x][y]] if board[x][y] else 0
+    if transposed:
+        result = [list(col) for col in zip(*result)]
+    return result
+
+
+class SolutionCache:
+    def __init__(self, capacity=4096, path=None, engine=None):
+        # Initialize the in-memory entries from least to most recently used
+        self.capacity = capacity
+        self.engine = engine
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        # Initialize the new entries waiting to be written, so the store is only locked for one short write at a time
+        self.pending = {}
+
+        # Open the persistent store when a path is given
+        self.connection = None
+        if path:
+            self.connection = sqlite3.connect(path, timeout=30)
+            self.connection.execute("CREATE TABLE IF NOT EXISTS solutions (puzzle TEXT PRIMARY KEY, solution TEXT)")
+            self.connection.commit()
+
+    def lookup(self, key):
+        # Check the in-memory entries first, then the persistent store
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        if key in self.pending:
+            self.remember(key, self.pending[key])
+            return self.pending[key]
+        if self.connection:
+            row = self.connection.execute("SELECT solution FROM solutions WHERE puzzle = ?", (key,)).fetchone()
+            if row:
+                self.remember(key, row[0])
+                return row[0]
+        return None
+
+    def remember(self, key, solution):
+        # Register the entry and evict the least recently used one once full
+        self.entries[key] = solution
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def store(self, key, solution):
+        self.remember(key, solution)
+        if self.connection:
+            self.pending[key] = solution
+
+    def solve(self, puzzle):
+        # Look the puzzle up as given first, which needs no canonical form
+        line = algo.formatPuzzle(puzzle)
+        solution = self.lookup(line)
+        if solution is not None:
+            self.hits += 1
+            return self.result(solution)
+
+        # Look the puzzle up by its canonical form, which most equivalent puzzles share
+        canonical, transform = canonicalForm(puzzle)
+        key = algo.formatPuzzle(canonical)
+        solution = self.lookup(key)
+        if solution is not None:
+            self.hits += 1
+        else:
+            # Solve the canonical board and remember the outcome
+            self.misses += 1
+            solution = algo.solve(canonical, engine=self.engine)["Solution"]
+            solution = "Unsolvable" if solution == "Unsolvable" else algo.formatPuzzle(solution)
+            self.store(key, solution)
+
+        # Map the stored solution back to the orientation of the puzzle and remember it as given
+        if solution != "Unsolvable":
+            solution = algo.formatPuzzle(fromCanonical(algo.parsePuzzle(solution), transform))
+        if line != key:
+            self.store(line, solution)
+        return self.result(solution)
+
+    def result(self, solution):
+        # Rebuild the solve result from a stored solution line
+        if solution == "Unsolvable":
+            return {"Solution": "Unsolvable", "Moves": [], "Skip": False}
+        return {"Solution": algo.parsePuzzle(solution), "Moves": [], "Skip": False}
+
+    def stats(self):
+        return {"Hits": self.hits, "Misses": self.misses, "Size": len(self.entries)}
+
+    def commit(self):
+        # Write the new entries to the persistent store in a single transaction
+        if self.connection and self.pending:
+            self.connection.executemany("INSERT OR REPLACE INTO solutions VALUES (?, ?)", self.pending.items())
+            self.connection.commit()
+            self.pending = {}
+
+    def close(self):
+        if self.connection:
+            self.commit()
+            self.connection.close()
+            self.connection = None
+
+
+def getCache(path=None, capacity=4096, engine=None):
+    # Share one cache per store and engine within each process
+    if (path, engine) not in caches:
+        caches[(path, engine)] = SolutionCache(capacity, path, engine)
+    return caches[(path, engine)]
+
+
+def cachedSolve(puzzle, engine=None, path=None):
+    # Solve through the shared cache of the process, saving any new entry right away
+    cache = getCache(path, engine=engine)
+    result = cache.solve(puzzle)
+    cache.commit()
+    return result
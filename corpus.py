@@ -0,0 +1,267 @@
+# Import necessary libraries
+import argparse
+import mmap
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+
+# Import Created Libraries
+import algorithm as algo
+import grader
+
+# Initialize the layout of the header, which the index entries follow before the records start
+magic = b"SDKC"
+version = 1
+header_format = struct.Struct("<4sBBHIII")
+entry_format = struct.Struct("<BBxxII")
+
+# Initialize the bytes of records held for each group before they are spooled to disk
+spool_size = 1 << 16
+
+# Initialize the difficulty stored for puzzles that were not graded
+ungraded = 255
+
+# Initialize the difficulty bands in the order they are numbered within the file
+difficulties = [band for band, ceiling in grader.difficulty_bands]
+
+
+def recordSize(size):
+    # Pack two cells per byte for the puzzle, then again for the solution
+    return 2 * ((size * size + 1) // 2)
+
+
+def packCells(cells):
+    # Store each cell in four bits, the first cell of a pair in the high half of the byte
+    cells = list(cells)
+    if len(cells) % 2:
+        cells.append(0)
+    return bytes(cells[index] << 4 | cells[index + 1] for index in range(0, len(cells), 2))
+
+
+def unpackCells(data, total):
+    # Split each byte back into its two cells
+    cells = []
+    for byte in data:
+        cells.append(byte >> 4)
+        cells.append(byte & 15)
+    return cells[:total]
+
+
+def difficultyCode(difficulty):
+    # Number the difficulty bands in order, keeping ungraded puzzles apart
+    if difficulty is None:
+        return ungraded
+    if isinstance(difficulty, int):
+        return difficulty
+    return difficulties.index(difficulty)
+
+
+class CorpusWriter:
+    def __init__(self, path, size=algo.board_size, directory=None):
+        # Four bits only leave room for the entries of boards up to 9x9
+        if size > 15:
+            raise ValueError("Boards larger than 9x9 do not fit in four bits per cell")
+        self.path = path
+        self.size = size
+        self.buckets = {}
+        self.counts = {}
+        self.count = 0
+
+        # Spool the records of each group to its own file on disk so memory stays flat on large sets
+        self.folder = tempfile.TemporaryDirectory(dir=directory)
+
+    def add(self, puzzle, solution=None, difficulty=None):
+        # Solve the puzzle when no solution is given
+        if len(puzzle) != self.size:
+            raise ValueError("Expected a " + str(self.size) + "x" + str(self.size) + " board")
+        if solution is None:
+            solution = algo.solve([list(row) for row in puzzle])["Solution"]
+            if solution == "Unsolvable":
+                raise ValueError("[!] Unsolvable")
+
+        # File the record under its difficulty and clue count
+        cells = [num for row in puzzle for num in row]
+        key = (difficultyCode(difficulty), sum(1 for num in cells if num))
+        bucket = self.buckets.setdefault(key, bytearray())
+        bucket += packCells(cells)
+        bucket += packCells(num for row in solution for num in row)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+        if len(bucket) >= spool_size:
+            self.spool(key)
+
+    def spoolPath(self, key):
+        return os.path.join(self.folder.name, "{}-{}".format(*key))
+
+    def spool(self, key):
+        # Append the records held for the group to its file, only keeping the file open while writing
+        with open(self.spoolPath(key), "ab") as spool:
+            spool.write(self.buckets[key])
+        self.buckets[key] = bytearray()
+
+    def close(self):
+        # Lay the records out grouped by difficulty then clue count, indexing where each group starts
+        entries, start = [], 0
+        for key in sorted(self.counts):
+            entries.append((key[0], key[1], start, self.counts[key]))
+            start += self.counts[key]
+
+        try:
+            with open(self.path, "wb") as target:
+                target.write(header_format.pack(magic, version, self.size, 0, recordSize(self.size), self.count, len(entries)))
+                for entry in entries:
+                    target.write(entry_format.pack(*entry))
+                for key in sorted(self.counts):
+                    self.spool(key)
+                    with open(self.spoolPath(key), "rb") as spool:
+                        shutil.copyfileobj(spool, target)
+        finally:
+            self.discard()
+
+    def discard(self):
+        # Remove the spooled records
+        self.buckets = {}
+        self.counts = {}
+        self.folder.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        # Only write the file out when every record made it in
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class Corpus:
+    def __init__(self, path):
+        # Map the file into memory so records are only read when accessed
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Read the header and the index of record groups
+        tag, file_version, self.size, reserved, self.record_size, self.count, entries = header_format.unpack_from(self.data, 0)
+        if tag != magic or file_version != version:
+            raise ValueError("Not a puzzle corpus: " + str(path))
+        self.index = {}
+        for entry in range(entries):
+            difficulty, clues, start, count = entry_format.unpack_from(self.data, header_format.size + entry * entry_format.size)
+            self.index[(difficulty, clues)] = (start, count)
+        self.offset = header_format.size + entries * entry_format.size
+        self.total_cells = self.size * self.size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return self.record(index)
+
+    def record(self, index):
+        # Seek straight to the fixed-size record and unpack the puzzle and solution
+        if not 0 <= index < self.count:
+            raise IndexError("Record " + str(index) + " out of range")
+        start = self.offset + index * self.record_size
+        half = self.record_size // 2
+        puzzle = unpackCells(self.data[start:start + half], self.total_cells)
+        solution = unpackCells(self.data[start + half:start + self.record_size], self.total_cells)
+        size = self.size
+        return ([puzzle[row:row + size] for row in range(0, self.total_cells, size)],
+                [solution[row:row + size] for row in range(0, self.total_cells, size)])
+
+    def groups(self, difficulty=None, clues=None):
+        # List the record ranges matching the difficulty and the clue count, or a (least, most) range of them
+        code = None if difficulty is None else difficultyCode(difficulty)
+        low, high = (clues, clues) if isinstance(clues, int) else (clues or (0, self.total_cells))
+        return [(start, count) for (group_difficulty, group_clues), (start, count) in sorted(self.index.items())
+                if (code is None or group_difficulty == code) and low <= group_clues <= high]
+
+    def randomRecord(self, difficulty=None, clues=None, rng=random):
+        # Pick uniformly among the matching records without touching any other
+        groups = self.groups(difficulty, clues)
+        total = sum(count for start, count in groups)
+        if not total:
+            return None
+        pick = rng.randrange(total)
+        for start, count in groups:
+            if pick < count:
+                return self.record(start + pick)
+            pick -= count
+
+    def summary(self):
+        # Count the records of each difficulty and clue count
+        return [(difficulties[difficulty] if difficulty != ungraded else "Ungraded", clues, count)
+                for (difficulty, clues), (start, count) in sorted(self.index.items())]
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def prepareRecord(line):
+    # Generate a puzzle when no line is given, then solve and grade it
+    puzzle = algo.generatePuzzle() if line is None else algo.parsePuzzle(line)
+    if puzzle is None or len(puzzle) != algo.board_size or algo.boardValidation(puzzle):
+        return None
+    solution = algo.solve([row[:] for row in puzzle])["Solution"]
+    if solution == "Unsolvable":
+        return None
+    return puzzle, solution, grader.gradePuzzle(puzzle)["Difficulty"]
+
+
+def main(argv=None):
+    # Parse the command line options
+    parser = argparse.ArgumentParser(description="Pack puzzles with their solutions and difficulty into a binary corpus, or list one.")
+    parser.add_argument("output", help="corpus file to write, or to list with --info")
+    parser.add_argument("--input", default=None, help="file with one 9x9 puzzle per line (- for stdin)")
+    parser.add_argument("--generate", type=int, default=0, help="number of new puzzles to generate")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--tmpdir", default=None, help="directory for the records spooled while packing")
+    parser.add_argument("--info", action="store_true", help="list the records of each difficulty and clue count")
+    args = parser.parse_args(argv)
+
+    if args.info:
+        with Corpus(args.output) as corpus:
+            for difficulty, clues, count in corpus.summary():
+                print("{:<10} {:>3} clues {:>9}".format(difficulty, clues, count))
+            print("{} records".format(len(corpus)))
+        return
+
+    # Gather the lines to pack followed by the puzzles to generate
+    source = None
+    lines = []
+    if args.input:
+        source = sys.stdin if args.input == "-" else open(args.input)
+        lines = (line for line in source if line.strip())
+    jobs = (job for part in (lines, [None] * args.generate) for job in part)
+
+    # Solve and grade the puzzles over a pool while writing them out
+    start = time.perf_counter()
+    skipped = 0
+    try:
+        with CorpusWriter(args.output, directory=args.tmpdir) as writer, Pool(args.processes) as pool:
+            for record in pool.imap(prepareRecord, jobs, 64):
+                if record is None:
+                    skipped += 1
+                else:
+                    writer.add(*record)
+    finally:
+        if source not in (None, sys.stdin):
+            source.close()
+    sys.stderr.write("Packed {} puzzles, skipped {} in {:.2f}s\n".format(writer.count, skipped, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# Import necessary libraries
+import argparse
+import hashlib
+import heapq
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+
+# Import Created Libraries
+import algorithm as algo
+import cache
+
+
+def invariantHash(puzzle):
+    # Count the hints of every row, column, sub matrix and digit
+    geometry = algo.geometryOf(puzzle)
+    size, sub, cell_sub = geometry.board_size, geometry.sub_size, geometry.cell_sub
+    rows, cols, subs, digits = [0] * size, [0] * size, [0] * size, [0] * (size + 1)
+    hints = []
+    for x, row in enumerate(puzzle):
+        for y, num in enumerate(row):
+            if num:
+                box = cell_sub[x * size + y]
+                rows[x] += 1
+                cols[y] += 1
+                subs[box] += 1
+                digits[num] += 1
+                hints.append((x, y, box, num))
+
+    # Describe each hint by how crowded its lines, sub matrix and digit are, which no transformation changes
+    features = sorted((min(rows[x], cols[y]), max(rows[x], cols[y]), subs[box], digits[num]) for x, y, box, num in hints)
+
+    # Describe the bands and stacks by their sorted line counts, in either order for the transpose
+    bands = sorted(tuple(sorted(rows[band * sub:band * sub + sub])) for band in range(sub))
+    stacks = sorted(tuple(sorted(cols[stack * sub:stack * sub + sub])) for stack in range(sub))
+    outline = sorted([bands, stacks])
+    return hashlib.blake2b(repr((size, features, outline)).encode(), digest_size=8).hexdigest()
+
+
+def canonicalHash(puzzle):
+    # Hash the canonical form, which equivalent 9x9 puzzles share unless they are sparse enough to overflow the tie limit
+    # of cache.canonicalForm, and which larger boards only share under row, band and relabeling changes
+    canonical, transform = cache.canonicalForm(puzzle)
+    return hashlib.blake2b(algo.formatPuzzle(canonical).encode(), digest_size=16).hexdigest()
+
+
+def lineInvariant(line):
+    # Hash a puzzle line, leaving lines that are not puzzles without a hash
+    line = line.strip()
+    puzzle = algo.parsePuzzle(line)
+    return line, invariantHash(puzzle) if puzzle is not None else None
+
+
+def dedupShard(path):
+    # Group the records of the shard by their cheap hash
+    groups = {}
+    with open(path) as shard:
+        for record in shard:
+            index, digest, line = record.split()
+            groups.setdefault(digest, []).append((int(index), line))
+
+    # Only compute canonical hashes where cheap hashes collide, keeping the first of each puzzle
+    kept = []
+    for records in groups.values():
+        if len(records) == 1:
+            kept.extend(records)
+            continue
+        seen, lines_seen = set(), set()
+        for index, line in sorted(records):
+            # Exact repeats need no canonical hash
+            if line in lines_seen:
+                continue
+            lines_seen.add(line)
+            digest = canonicalHash(algo.parsePuzzle(line))
+            if digest not in seen:
+                seen.add(digest)
+                kept.append((index, line))
+
+    # Rewrite the shard with the kept records in input order
+    kept.sort()
+    with open(path, "w") as shard:
+        for index, line in kept:
+            shard.write(str(index) + " " + line + "\n")
+    return len(kept)
+
+
+def readShard(path):
+    with open(path) as shard:
+        for record in shard:
+            index, line = record.split()
+            yield int(index), line
+
+
+def dedupLines(lines, shards=256, directory=None, processes=None, chunksize=1024, counts=None):
+    # Track the number of lines read, skipped as invalid and kept
+    counts = counts if counts is not None else {}
+    counts.update({"Read": 0, "Invalid": 0, "Kept": 0})
+    lines = (line for line in lines if line.strip())
+
+    with tempfile.TemporaryDirectory(dir=directory) as folder, Pool(processes) as pool:
+        # Spread the lines over shard files on disk by their cheap hash
+        paths = [os.path.join(folder, str(shard)) for shard in range(shards)]
+        files = [open(path, "w") for path in paths]
+        try:
+            for index, (line, digest) in enumerate(pool.imap(lineInvariant, lines, chunksize)):
+                counts["Read"] += 1
+                if digest is None:
+                    counts["Invalid"] += 1
+                    continue
+                files[int(digest, 16) % shards].write(str(index) + " " + digest + " " + line + "\n")
+        finally:
+            for shard in files:
+                shard.close()
+
+        # Remove the duplicates within each shard, which only ever share it with their equivalents, keeping any equivalents
+        # the canonical form cannot tell apart
+        counts["Kept"] = sum(pool.imap_unordered(dedupShard, paths))
+
+        # Merge the shards back into input order
+        for index, line in heapq.merge(*[readShard(path) for path in paths]):
+            yield line
+
+
+def main(argv=None):
+    # Parse the command line options
+    parser = argparse.ArgumentParser(description="Drop puzzles equivalent to an earlier one under relabeling, row, column, band and stack swaps and transpose. "
+                                                 "Boards larger than 9x9 are only compared under relabeling and row and band swaps.")
+    parser.add_argument("input", nargs="?", default="-", help="file with one puzzle per line (default: stdin)")
+    parser.add_argument("--shards", type=int, default=256, help="number of shard files on disk")
+    parser.add_argument("--tmpdir", default=None, help="directory for the shard files")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    # Stream the unique puzzles to stdout and report the counts to stderr
+    source = sys.stdin if args.input == "-" else open(args.input)
+    start = time.perf_counter()
+    counts = {}
+    try:
+        for line in dedupLines(source, args.shards, args.tmpdir, args.processes, counts=counts):
+            sys.stdout.write(line + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    sys.stderr.write("Kept {} of {} puzzles, skipped {} invalid lines in {:.2f}s\n".format(
+        counts["Kept"], counts["Read"], counts["Invalid"], time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
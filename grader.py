@@ -0,0 +1,284 @@
+# Import necessary libraries
+from itertools import combinations
+from multiprocessing import Pool
+
+# Import Created Libraries
+import algorithm as algo
+
+# Initialize the rating of each technique from easiest to hardest
+ratings = {"Hidden Single": 1.2, "Naked Single": 2.3, "Pointing": 2.6, "Claiming": 2.8,
+           "Naked Pair": 3.0, "X-Wing": 3.2, "Hidden Pair": 3.4, "Naked Triple": 3.6,
+           "Swordfish": 3.8, "Hidden Triple": 4.0, "XY-Wing": 4.2, "Simple Coloring": 5.0,
+           "XY-Chain": 6.6, "Guessing": 10.0}
+
+# Initialize the highest rating allowed within each difficulty band
+difficulty_bands = [("Easy", 2.3), ("Medium", 3.0), ("Hard", 4.0), ("Expert", 6.6), ("Extreme", 10.0)]
+
+
+def openCells(state, cells, bit):
+    # Collect the open cells of a unit that still hold the candidate
+    return [cell for cell in cells if not state.values[cell] and state.candidates[cell] & bit]
+
+
+def eliminateFrom(state, cells, bits, technique):
+    # Remove the candidates from each cell and report whether anything changed
+    changed = False
+    for cell in cells:
+        if not state.values[cell] and state.candidates[cell] & bits:
+            changed = True
+            if not state.eliminate(cell, bits, technique):
+                break
+    return changed
+
+
+def lockedCandidates(state):
+    geometry = state.geometry
+    # Loop through every unit for digits confined to its intersection with another unit
+    for unit, cells in enumerate(geometry.units):
+        for num in range(1, geometry.board_size + 1):
+            bit = 1 << (num - 1)
+            spots = openCells(state, cells, bit)
+            if not spots:
+                continue
+            # Pointing removes the digit from the rest of the shared row or column
+            if unit >= 2 * geometry.board_size:
+                for line_of, offset in ((geometry.cell_row, 0), (geometry.cell_col, geometry.board_size)):
+                    if all(line_of[cell] == line_of[spots[0]] for cell in spots):
+                        targets = [cell for cell in geometry.units[offset + line_of[spots[0]]] if cell not in cells]
+                        if eliminateFrom(state, targets, bit, "Pointing"):
+                            return "Pointing"
+            # Claiming removes the digit from the rest of the shared sub matrix
+            elif all(geometry.cell_sub[cell] == geometry.cell_sub[spots[0]] for cell in spots):
+                targets = [cell for cell in geometry.units[2 * geometry.board_size + geometry.cell_sub[spots[0]]] if cell not in cells]
+                if eliminateFrom(state, targets, bit, "Claiming"):
+                    return "Claiming"
+
+
+def nakedSubset(state, count, technique):
+    geometry = state.geometry
+    # Look for a group of cells sharing exactly as many candidates as there are cells
+    for cells in geometry.units:
+        open_cells = [cell for cell in cells if not state.values[cell]]
+        small = [cell for cell in open_cells if bin(state.candidates[cell]).count("1") <= count]
+        for group in combinations(small, count):
+            union = 0
+            for cell in group:
+                union |= state.candidates[cell]
+            if bin(union).count("1") == count:
+                targets = [cell for cell in open_cells if cell not in group]
+                if eliminateFrom(state, targets, union, technique):
+                    return technique
+
+
+def hiddenSubset(state, count, technique):
+    geometry = state.geometry
+    # Look for a group of digits confined to exactly as many cells as there are digits
+    for cells in geometry.units:
+        open_cells = [cell for cell in cells if not state.values[cell]]
+        remaining = 0
+        for cell in open_cells:
+            remaining |= state.candidates[cell]
+        digits = [1 << (num - 1) for num in range(1, geometry.board_size + 1) if remaining & (1 << (num - 1))]
+        for group in combinations(digits, count):
+            union = sum(group)
+            spots = [cell for cell in open_cells if state.candidates[cell] & union]
+            if len(spots) == count:
+                # Remove every other candidate from the confined cells
+                changed = False
+                for cell in spots:
+                    if state.candidates[cell] & ~union:
+                        changed = True
+                        if not state.eliminate(cell, state.candidates[cell] & ~union, technique):
+                            break
+                if changed:
+                    return technique
+
+
+def fish(state, count, technique):
+    geometry = state.geometry
+    # Try each digit with rows as base lines and then with columns as base lines
+    size = geometry.board_size
+    for num in range(1, size + 1):
+        bit = 1 << (num - 1)
+        for base_offset, cover_offset, line_of in ((0, size, geometry.cell_col), (size, 0, geometry.cell_row)):
+            # Record the cover lines each base line places the digit on
+            bases = []
+            for line in range(size):
+                spots = openCells(state, geometry.units[base_offset + line], bit)
+                if 2 <= len(spots) <= count:
+                    bases.append((line, set(line_of[cell] for cell in spots)))
+            # Check if the digit in a group of base lines is confined to as many cover lines
+            for group in combinations(bases, count):
+                covers = set()
+                for line, spots in group:
+                    covers |= spots
+                if len(covers) == count:
+                    base_lines = set(line for line, spots in group)
+                    targets = [cell for cover in covers for cell in geometry.units[cover_offset + cover]
+                               if (geometry.cell_row[cell] if base_offset == 0 else geometry.cell_col[cell]) not in base_lines]
+                    if eliminateFrom(state, targets, bit, technique):
+                        return technique
+
+
+def xyWing(state):
+    geometry = state.geometry
+    # Initialize the cells with exactly two candidates
+    pairs = [cell for cell in range(geometry.total_cells)
+             if not state.values[cell] and bin(state.candidates[cell]).count("1") == 2]
+    for pivot in pairs:
+        pivot_peers = set(geometry.peers[pivot])
+        wings = [cell for cell in pairs if cell in pivot_peers]
+        for first, second in combinations(wings, 2):
+            # Each wing shares a different candidate with the pivot and one with each other
+            first_mask, second_mask = state.candidates[first], state.candidates[second]
+            shared = first_mask & second_mask
+            if bin(shared).count("1") != 1 or shared & state.candidates[pivot]:
+                continue
+            if (first_mask | second_mask) & ~shared != state.candidates[pivot]:
+                continue
+            # Remove the shared candidate from every cell seeing both wings
+            targets = set(geometry.peers[first]) & set(geometry.peers[second])
+            if eliminateFrom(state, targets - {pivot}, shared, "XY-Wing"):
+                return "XY-Wing"
+
+
+def simpleColoring(state):
+    geometry = state.geometry
+    size = geometry.board_size
+    for num in range(1, size + 1):
+        bit = 1 << (num - 1)
+        # Link the two spots of every unit holding the digit exactly twice
+        links = {}
+        for cells in geometry.units:
+            spots = openCells(state, cells, bit)
+            if len(spots) == 2:
+                links.setdefault(spots[0], set()).add(spots[1])
+                links.setdefault(spots[1], set()).add(spots[0])
+
+        # Color each chain of linked cells with two alternating colors
+        colors = {}
+        for start in links:
+            if start in colors:
+                continue
+            chain = {start: 0}
+            stack = [start]
+            while stack:
+                cell = stack.pop()
+                for other in links[cell]:
+                    if other not in chain:
+                        chain[other] = 1 - chain[cell]
+                        stack.append(other)
+            colors.update(chain)
+            groups = [[cell for cell in chain if chain[cell] == color] for color in (0, 1)]
+
+            # A color appearing twice in one unit is false everywhere
+            for group in groups:
+                if any(other in geometry.peers[cell] for cell, other in combinations(group, 2)):
+                    if eliminateFrom(state, group, bit, "Simple Coloring"):
+                        return "Simple Coloring"
+
+            # A cell outside the chain seeing both colors cannot hold the digit
+            seen = [set(), set()]
+            for color, group in enumerate(groups):
+                for cell in group:
+                    seen[color].update(geometry.peers[cell])
+            targets = [cell for cell in seen[0] & seen[1] if cell not in chain]
+            if eliminateFrom(state, targets, bit, "Simple Coloring"):
+                return "Simple Coloring"
+
+
+def xyChain(state):
+    geometry = state.geometry
+    # Initialize the cells with exactly two candidates
+    pairs = set(cell for cell in range(geometry.total_cells)
+                if not state.values[cell] and bin(state.candidates[cell]).count("1") == 2)
+    for start in pairs:
+        mask = state.candidates[start]
+        for end_bit in (mask & -mask, mask & (mask - 1)):
+            # Walk through the pairs, leaving each cell by its other candidate
+            visited = {(start, mask ^ end_bit)}
+            stack = [(start, mask ^ end_bit)]
+            while stack:
+                cell, exit_bit = stack.pop()
+                for other in geometry.peers[cell]:
+                    if other not in pairs or not state.candidates[other] & exit_bit:
+                        continue
+                    next_bit = state.candidates[other] ^ exit_bit
+                    if (other, next_bit) in visited:
+                        continue
+                    visited.add((other, next_bit))
+                    # A chain ending on the starting candidate removes it from cells seeing both ends
+                    if next_bit == end_bit and other != start:
+                        targets = set(geometry.peers[start]) & set(geometry.peers[other])
+                        if eliminateFrom(state, targets, end_bit, "XY-Chain"):
+                            return "XY-Chain"
+                    stack.append((other, next_bit))
+
+
+# Initialize the techniques tried after singles from easiest to hardest
+advanced_techniques = [
+    lockedCandidates,
+    lambda state: nakedSubset(state, 2, "Naked Pair"),
+    lambda state: fish(state, 2, "X-Wing"),
+    lambda state: hiddenSubset(state, 2, "Hidden Pair"),
+    lambda state: nakedSubset(state, 3, "Naked Triple"),
+    lambda state: fish(state, 3, "Swordfish"),
+    lambda state: hiddenSubset(state, 3, "Hidden Triple"),
+    xyWing,
+    simpleColoring,
+    xyChain]
+
+
+def gradePuzzle(puzzle):
+    # Register the hints and only let the state apply singles on its own
+    state = algo.Propagator(puzzle, subsets=False, locked=False)
+    state.eliminations = dict.fromkeys(ratings, 0)
+    steps = dict.fromkeys(ratings, 0)
+
+    # Keep applying the easiest technique that makes progress
+    while state.propagate() and not all(state.values):
+        for technique in advanced_techniques:
+            used = technique(state)
+            if used:
+                steps[used] += 1
+                break
+        else:
+            # Fall back to guessing when no technique makes progress
+            steps["Guessing"] += 1
+            break
+
+    # Return an invalid grade when the hints contradict each other
+    if state.error:
+        return {"Technique": None, "Score": None, "Difficulty": None, "Steps": steps, "Error": state.error}
+
+    # Find the hardest technique used and its difficulty band
+    steps["Naked Single"] = state.placements["Naked Single"]
+    steps["Hidden Single"] = state.placements["Hidden Single"]
+    used = [technique for technique in ratings if steps[technique]]
+    hardest = max(used, key=lambda technique: ratings[technique]) if used else None
+    score = ratings[hardest] if hardest else 0.0
+    difficulty = next(band for band, ceiling in difficulty_bands if score <= ceiling)
+    return {"Technique": hardest, "Score": score, "Difficulty": difficulty, "Steps": steps, "Error": None}
+
+
+def gradePuzzles(puzzles, processes=None, chunksize=256):
+    # Grade in the current process when a single worker is requested
+    if processes == 1:
+        for puzzle in puzzles:
+            yield gradePuzzle(puzzle)
+        return
+
+    # Spread the puzzles over a pool of workers while keeping their order
+    with Pool(processes) as pool:
+        for grade in pool.imap(gradePuzzle, puzzles, chunksize):
+            yield grade
+
+
+def generateGraded(difficulty, attempts=None, size=algo.board_size):
+    # Keep generating puzzles until one falls within the difficulty band
+    while attempts is None or attempts > 0:
+        puzzle = algo.generatePuzzle(size=size)
+        if gradePuzzle(puzzle)["Difficulty"] == difficulty:
+            return puzzle
+        if attempts is not None:
+            attempts -= 1
@@ -1,13 +1,17 @@
 # Import Necessary Libraries
-from tkinter import Tk, Frame, Canvas, Button, Event, Label, StringVar, OptionMenu
-from PIL import ImageTk, Image
-from copy import deepcopy
+import queue
+import sys
+import threading
+import time
+from tkinter import Tk, Frame, Canvas, Button, Event, Label, StringVar, OptionMenu, Scale
 
 # Import Created Libraries
 import algorithm as algo
+import corpus
+import playback
 
 class GameGUI(Frame):
-    def __init__(self, parent):
+    def __init__(self, parent, corpus_path=None):
         # Configure GUI dimensions
         self.board_size = 9
         
@@ -38,7 +42,7 @@ class GameGUI(Frame):
 
         # Initialize puzzle variables
         self.row, self.col = -1, -1
-        self.original_puzzle = [
+        self.original_puzzle = algo.Board.fromList([
             [0, 3, 0, 0, 1, 0, 0, 6, 0],
             [7, 5, 0, 0, 3, 0, 0, 4, 8],
             [0, 0, 6, 9, 8, 4, 3, 0, 0],
@@ -47,233 +51,346 @@ class GameGUI(Frame):
             [0, 0, 4, 0, 0, 0, 5, 0, 0],
             [0, 0, 1, 6, 7, 5, 2, 0, 0],
             [6, 8, 0, 0, 9, 0, 0, 1, 5],
-            [0, 9, 0, 0, 4, 0, 0, 3, 0]]
-        self.puzzle = deepcopy(self.original_puzzle)
+            [0, 9, 0, 0, 4, 0, 0, 3, 0]])
+        self.puzzle = self.original_puzzle.copy()
+        self.tracker = algo.ConflictTracker(self.puzzle)
         self.collection = {"Solution": None, "Moves": [], "Skip": False}
-        self.timer = {"Hour": 0, "Minute": 0,
-                      "Second": 0, "Millisecond": 0, "Pause": False}
+        self.current_move = None
+        self.timer = {"Elapsed": 0.0, "Pause": False}
+        self.last_tick = time.monotonic()
         self.win = False
         self.loading = False
 
+        # Initialize solve playback speeds in moves per second, where None plays as fast as each frame allows
+        self.speed_legend = {"Slow": 50, "Normal": 500, "Fast": 5000, "Faster": 50000, "Fastest": None}
+        self.speed_category = "Normal"
+        self.frame_time = 16  # Milliseconds between playback frames
+        self.frame_budget = 0.012  # Seconds of each frame spent applying moves
+        self.scrubber = None
+        self.scrubbing = False
+
         # Initialize Frames
         self.game_canvas = None
+        self.cell_items = None
+        self.cell_states = None
+        self.grid_items = None
         self.menu_frame = None
+        self.submenus = None
+        self.submenu_frame = None
+        self.menu_widgets = None
         self.settings_frame = None
+        self.settings_widgets = None
+
+        # Initialize the settings icon resized for each margin, and the look each frame was last laid out with
+        self.icon_source = None
+        self.icons = {}
+        self.board_layout = None
+        self.menu_layout = None
+        self.settings_layout = None
 
         # Initialize Inner Frames
         self.initBoard()
         self.initMenu()
 
+        # Draw puzzles from a packed corpus when one is given, otherwise generate them ahead of time on a background thread so the window never blocks
+        self.prefetch = queue.Queue(maxsize=3)
+        self.corpus = corpus.Corpus(corpus_path) if corpus_path else None
+        if self.corpus is None or not len(self.corpus):
+            threading.Thread(target=self.fillPrefetch, daemon=True).start()
+
         # Start-up the timer
         self.updateTimer()
 
     def initBoard(self):
-        # Create the Game Canvas and pack it into the frame
-        self.game_canvas = Canvas(
-            self, width=self.width, height=self.height, bg='white', highlightthickness=0)
+        if self.game_canvas is None:
+            # Create the Game Canvas and bind keys to it for tracking
+            self.game_canvas = Canvas(
+                self, width=self.width, height=self.height, bg='white', highlightthickness=0)
+            self.game_canvas.bind("<Button-1>", self.cellClicked)
+            self.game_canvas.bind("<Key>", self.keyPressed)
+        else:
+            # Resize the existing canvas and drop the selection, keeping every other item to be moved into place
+            self.game_canvas.configure(width=self.width, height=self.height)
+            self.game_canvas.delete("selected_highlight", "load")
+            self.row, self.col = -1, -1
         self.game_canvas.pack(fill='both', side='top')
+        self.board_layout = (self.screen_size, self.font)
 
-        # Create Gear Icon for settings at the corner of the canvas
-        self.png = Image.open('assets/settings.png')
-        self.png = self.png.resize((self.margin, self.margin), Image.ANTIALIAS)
-        self.img = ImageTk.PhotoImage(self.png)
-        self.game_canvas.create_image(
-            self.width-self.margin//2, self.margin//2, image=self.img, tags='settings')
+        # Move the cells of any previous layout into place and restyle each of them on the next draw
+        if self.cell_items:
+            self.placeCells()
+            self.cell_states = [None] * len(self.cell_items)
 
         # Draw the board contents within the canvas
         self.drawPuzzle()
         self.drawGrid()
 
-        # Bind keys to the canvas for tracking
-        self.game_canvas.bind("<Button-1>", self.cellClicked)
-        self.game_canvas.bind("<Key>", self.keyPressed)
+        # Draw the settings icon once the board is on screen so loading it never delays the first paint
+        self.after_idle(self.drawIcon)
+
+    def drawIcon(self):
+        # Load Pillow and the icon only when first needed, then keep a resized copy for each margin
+        if self.margin not in self.icons:
+            from PIL import ImageTk, Image
+            if self.icon_source is None:
+                with Image.open('assets/settings.png') as png:
+                    self.icon_source = png.copy()
+            self.icons[self.margin] = ImageTk.PhotoImage(self.icon_source.resize((self.margin, self.margin), Image.LANCZOS))
+
+        # Create Gear Icon for settings at the corner of the canvas, or move the existing one there
+        x, y = self.width-self.margin//2, self.margin//2
+        icon = self.game_canvas.find_withtag('settings')
+        if icon:
+            self.game_canvas.coords(icon[0], x, y)
+            self.game_canvas.itemconfigure(icon[0], image=self.icons[self.margin])
+        else:
+            self.game_canvas.create_image(x, y, image=self.icons[self.margin], tags='settings')
 
     def initMenu(self):
-        if self.menu_frame:
-            self.menu_frame.destroy()
-        
         # Create the Menu Frame and pack it into the frame
-        self.menu_frame = Frame(self, width=self.width-self.margin*2,
-                                height=self.menu-self.margin, bg="white")
+        self.menu_frame = Frame(self, bg="white")
         self.menu_frame.pack()
 
         # Create a label for the timer
-        self.prompt_label = Label(self.menu_frame, text="{:0>2d}h {:0>2d}m {:0>2d}s".format(self.timer["Hour"], self.timer["Minute"], self.timer["Second"]), bg="ghost white", relief='solid', height=self.margin//15, width=(self.width-self.margin*2), font=self.font+self.fontsize_small)
+        self.prompt_label = Label(self.menu_frame, text=self.formatClock(), bg="ghost white", relief='solid')
         self.prompt_label.pack()
 
-        # Create a submenu inside a frame within the menu
-        self.submenu_frame = Frame(self.menu_frame, width=(self.width-self.margin*2), height=self.menu-self.margin, bg="white")
-        self.submenu_frame.pack(fill='both')
+        # Create every submenu once inside a frame within the menu, showing one at a time
+        self.submenus = {name: Frame(self.menu_frame, bg="white") for name in ("Menu", "Solve", "Input")}
+        self.submenu_frame = None
 
         # Initialize variables needed for the menu loop
         texts = [["Solve", "Reset"], ["Generate", "Input"]]
         commands = [[self.solveBoard, self.resetBoard], [self.generatePuzzle, self.inputPuzzle]]
         self.menu_buttons = {"Solve": '', "Reset": '', "Generate": '', "Input": ''}
-        
+
         # Loop through the grid of buttons
         for x in range(2):
             for y in range(2):
-                # Set the padding to equally space columns
-                xpadding = (0, self.margin//4) if y == 0 else (self.margin//4, 0)
-                
                 # Create and store the button
-                self.menu_buttons[texts[x][y]] = Button(self.submenu_frame, text=texts[x][y], width=(self.width-self.margin*2)//2, height=self.margin, bg='ghost white', activebackground='azure', relief='solid', font=self.font+self.fontsize_small, command=commands[x][y])
-                
-                # Insert each button into the menu in a 2x2 grid
-                self.menu_buttons[texts[x][y]].grid(row=x, column=y, sticky='NSEW', pady=(self.margin//2,0), padx=xpadding)
+                self.menu_buttons[texts[x][y]] = Button(self.submenus["Menu"], text=texts[x][y], bg='ghost white', activebackground='azure', relief='solid', command=commands[x][y])
 
-        # Configure grid and pack formatting to fit equally into the frame
+                # Insert each button into the menu in a 2x2 grid
+                self.menu_buttons[texts[x][y]].grid(row=x, column=y, sticky='NSEW')
+
+        # Insert a scrubber over the trace that pauses playback while it is held
+        self.scrubber = Scale(self.submenus["Solve"], from_=0, to=1, orient='horizontal', showvalue=0, bg='ghost white', troughcolor='azure',
+            relief='solid', highlightthickness=0, command=self.seekPlayback)
+        self.scrubber.grid(row=0, column=0, columnspan=2, sticky='NSEW')
+        self.scrubber.bind("<ButtonPress-1>", lambda event: self.holdScrubber(True))
+        self.scrubber.bind("<ButtonRelease-1>", lambda event: self.holdScrubber(False))
+
+        # Insert the speed options and the skip button below the scrubber
+        self.speed_variable = StringVar()
+        speed_menu = OptionMenu(self.submenus["Solve"], self.speed_variable, *self.speed_legend, command=self.updateSpeed)
+        speed_menu.config(bg='ghost white', activebackground='azure', relief='groove', highlightthickness=0)
+        speed_menu.grid(row=1, column=0, sticky='NSEW')
+        skip = Button(self.submenus["Solve"], text="Skip", bg='ghost white', activebackground='azure',
+            relief='solid', command=lambda: self.closeSubmenu("Solve"))
+        skip.grid(row=1, column=1, sticky='NSEW')
+
+        # Insert the button registering the player input
+        enter = Button(self.submenus["Input"], text="Enter", bg='ghost white', activebackground='azure',
+            relief='solid', command=lambda: self.closeSubmenu("Input"))
+        enter.pack()
+
+        # Configure grid and pack formatting to fit equally into each frame
         self.menu_frame.pack_propagate(0)
-        self.submenu_frame.grid_rowconfigure(0, weight=1)
-        self.submenu_frame.grid_columnconfigure(0, weight=1)
-        self.submenu_frame.grid_rowconfigure(1, weight=1)
-        self.submenu_frame.grid_columnconfigure(1, weight=1)
-        self.submenu_frame.grid_propagate(0)
+        for name in ("Menu", "Solve"):
+            self.submenus[name].grid_columnconfigure(0, weight=1)
+            self.submenus[name].grid_columnconfigure(1, weight=1)
+            self.submenus[name].grid_propagate(0)
+        self.submenus["Menu"].grid_rowconfigure(0, weight=1)
+        self.submenus["Menu"].grid_rowconfigure(1, weight=1)
+        self.submenus["Input"].pack_propagate(0)
+        self.menu_widgets = {"Speed": speed_menu, "Skip": skip, "Enter": enter}
+
+        # Size the widgets for the current look and start on the main menu
+        self.layoutMenu()
+        self.showSubmenu("Menu")
+
+    def layoutMenu(self):
+        # Resize and restyle the menu widgets in place for the current screen size and font
+        widgets = self.menu_widgets
+        font = self.font+self.fontsize_small
+        self.menu_frame.configure(width=self.width-self.margin*2, height=self.menu-self.margin)
+        self.prompt_label.configure(height=self.margin//15, width=(self.width-self.margin*2), font=font)
+        self.submenus["Menu"].configure(width=(self.width-self.margin*2), height=self.menu-self.margin)
+        self.submenus["Solve"].configure(width=self.width, height=self.menu)
+        self.submenus["Input"].configure(width=self.width, height=self.menu)
+
+        # Set the padding to equally space the columns of the button grid
+        for index, button in enumerate(self.menu_buttons.values()):
+            xpadding = (0, self.margin//4) if index % 2 == 0 else (self.margin//4, 0)
+            button.configure(width=(self.width-self.margin*2)//2, height=self.margin, font=font)
+            button.grid_configure(pady=(self.margin//2, 0), padx=xpadding)
+        self.scrubber.grid_configure(pady=(self.margin//2, 0))
+        widgets["Speed"].config(font=font)
+        widgets["Speed"].grid_configure(pady=(self.margin//2, 0), padx=(0, self.margin//4))
+        widgets["Skip"].configure(width=(self.width-self.margin*2)//2, font=font)
+        widgets["Skip"].grid_configure(pady=(self.margin//2, 0), padx=(self.margin//4, 0))
+        widgets["Enter"].configure(width=self.width-self.margin*2, height=self.margin, font=font)
+        widgets["Enter"].pack_configure(pady=(self.margin//2, 0))
+        self.menu_layout = (self.screen_size, self.font)
+
+    def showSubmenu(self, name):
+        # Set the visible submenu aside for another, showing the clock again on the main menu
+        if self.submenu_frame is not None:
+            self.submenu_frame.pack_forget()
+        self.submenu_frame = self.submenus[name]
+        self.submenu_frame.pack(fill='both')
+        if name == "Menu":
+            self.prompt_label.configure(text=self.formatClock())
+
+    def formatClock(self):
+        # Split the elapsed seconds into hours, minutes and seconds
+        seconds = int(self.timer["Elapsed"])
+        return "{:0>2d}h {:0>2d}m {:0>2d}s".format(seconds // 3600, seconds // 60 % 60, seconds % 60)
 
     def updateTimer(self):
-        if self.game_canvas:
-            # Check if the board has been solved
-            if algo.completeChecker(self.puzzle) and not algo.boardValidation(self.puzzle) and not self.win:
-                # Raise the win flag after algorithm
-                self.win = True
-                # Update the puzzle
-                self.drawPuzzle()
-                # Re-initialize Menu
-                self.initMenu()
-            elif not algo.completeChecker(self.puzzle) or algo.boardValidation(self.puzzle) and self.win:
-                # Lower the win flag if the solved board was changed
-                self.win = False
-                # Update the puzzle
-                self.drawPuzzle()
+        # Measure the time since the last tick on the monotonic clock so the timer never drifts
+        now = time.monotonic()
+        running = self.menu_frame and not self.timer["Pause"] and not self.win
+        if running:
+            self.timer["Elapsed"] += now - self.last_tick
+        self.last_tick = now
 
         # Cap the clock to update only when the menu_frame is visible
-        if self.menu_frame and not self.timer["Pause"] and not self.win:
-            # Update the timer variable
-            if self.timer["Minute"] == 59:
-                self.timer["Hour"] += 1
-                self.timer["Minute"] = 0
-            elif self.timer["Second"] == 59:
-                self.timer["Minute"] += 1
-                self.timer["Second"] = 0
-            elif self.timer["Millisecond"] == 990:
-                self.timer["Second"] += 1
-                self.timer["Millisecond"] = 0
-            else:
-                self.timer["Millisecond"] += 10
-
+        if running:
             # Update the timer label in the menu_frame
-            self.prompt_label.configure(text="{:0>2d}h {:0>2d}m {:0>2d}s".format(
-                self.timer["Hour"], self.timer["Minute"], self.timer["Second"]))
+            self.prompt_label.configure(text=self.formatClock())
+
+        # Recurse the clock to update as the next second comes up
+        self.after(1000 - int(self.timer["Elapsed"] * 1000) % 1000 if running else 1000, self.updateTimer)
+
+    def resetTimer(self, pause):
+        # Start the clock over, measuring the next tick from now
+        self.timer = {"Elapsed": 0.0, "Pause": pause}
+        self.last_tick = time.monotonic()
 
-        # Recurse the clock to update every second
-        self.after(10, self.updateTimer)
+    def resumeTimer(self):
+        # Unpause the clock without counting the time spent paused
+        self.timer["Pause"] = False
+        self.last_tick = time.monotonic()
+
+    def checkWin(self):
+        # Check if the board has been solved
+        if self.tracker.isSolved() and not self.win:
+            # Raise the win flag after algorithm
+            self.win = True
+            # Update the puzzle
+            self.drawPuzzle()
+            # Bring the main menu back
+            self.showSubmenu("Menu")
+        elif not self.tracker.isSolved() and self.win:
+            # Lower the win flag if the solved board was changed, counting the time from now on
+            self.win = False
+            self.last_tick = time.monotonic()
+            # Update the puzzle
+            self.drawPuzzle()
 
     def drawGrid(self):
-        # Clear the canvas of any grid lines before drawing new ones
-        self.game_canvas.delete("grid_lines")
-        self.game_canvas.delete("grid_thick")
-
-        # Loop and create horizontal and vertical lines across
-        for i in range(self.board_size + 1):
-            color = "black" if i % 3 == 0 else "seashell4"
-            w = 3 if i % 3 == 0 else 1
-            tag = "grid_thick" if i % 3 == 0 else "grid_lines"
-
-            # Vertical Lines
-            x0 = self.margin + i * self.cell_dim
-            y0 = self.margin
-            x1 = self.margin + i * self.cell_dim
-            y1 = self.height - self.margin
-            self.game_canvas.create_line(
-                x0, y0, x1, y1, width=w, fill=color, tags=tag)
-
-            # Horizontal Lines
-            x0 = self.margin
-            y0 = self.margin + i * self.cell_dim
-            x1 = self.width - self.margin
-            y1 = self.margin + i * self.cell_dim
-            self.game_canvas.create_line(
-                x0, y0, x1, y1, width=w, fill=color, tags=tag)
-
-        # Raise the thicker borders above the other components
-        self.game_canvas.tag_raise("grid_thick", "grid_lines")
+        # Create the grid lines the first time the canvas is drawn
+        if self.grid_items is None:
+            self.grid_items = []
+            for i in range(self.board_size + 1):
+                color = "black" if i % 3 == 0 else "seashell4"
+                w = 3 if i % 3 == 0 else 1
+                tag = "grid_thick" if i % 3 == 0 else "grid_lines"
+                self.grid_items.append((self.game_canvas.create_line(0, 0, 0, 0, width=w, fill=color, tags=tag),
+                                        self.game_canvas.create_line(0, 0, 0, 0, width=w, fill=color, tags=tag)))
+
+            # Raise the thicker borders above the other components
+            self.game_canvas.tag_raise("grid_thick", "grid_lines")
+
+        # Move the vertical and horizontal lines across the board for the current layout
+        for i, (vertical, horizontal) in enumerate(self.grid_items):
+            offset = self.margin + i * self.cell_dim
+            self.game_canvas.coords(vertical, offset, self.margin, offset, self.height - self.margin)
+            self.game_canvas.coords(horizontal, self.margin, offset, self.width - self.margin, offset)
+
+    def createCells(self):
+        # Create a background and an entry for every cell once, to be reconfigured as the board changes
+        self.cell_items = []
+        self.cell_states = []
+        for index in range(self.board_size * self.board_size):
+            rect = self.game_canvas.create_rectangle(0, 0, 0, 0, fill='', width=0, tags="cells")
+            text = self.game_canvas.create_text(0, 0, text='', tags="entries")
+            self.cell_items.append((rect, text))
+            self.cell_states.append(None)
+        self.placeCells()
+
+        # Keep the grid above the cells
+        self.game_canvas.tag_raise("grid_lines")
+        self.game_canvas.tag_raise("grid_thick")
+
+    def placeCells(self):
+        # Move the background and entry of every cell into place for the current layout
+        for index, (rect, text) in enumerate(self.cell_items):
+            x0 = self.margin + (index % self.board_size) * self.cell_dim
+            y0 = self.margin + (index // self.board_size) * self.cell_dim
+            self.game_canvas.coords(rect, x0, y0, x0 + self.cell_dim, y0 + self.cell_dim)
+            self.game_canvas.coords(text, x0 + self.cell_dim / 2, y0 + self.cell_dim / 2)
 
     def drawPuzzle(self):
-        # Clear the canvas of any puzzle components before drawing new puzzle
-        if self.game_canvas.find_withtag("entries"):
-            self.game_canvas.delete("entries")
-        if self.game_canvas.find_withtag("locked_cells"):
-            self.game_canvas.delete("locked_cells")
-        if self.game_canvas.find_withtag("algo_filled"):
-            self.game_canvas.delete("algo_filled")
-        if self.game_canvas.find_withtag("algo_current") and self.win:
-            self.game_canvas.delete("algo_current")
-        if self.game_canvas.find_withtag("solved_cells") and not self.win:
-            self.game_canvas.delete("solved_cells")
+        # Create the cell items the first time the canvas is drawn
+        if not self.cell_items:
+            self.createCells()
 
         # Initialze a variable for streak tracking within the algorithm
         streak = True
 
-        # Fill in each cell with the puzzle entry from the current puzzle state
+        # Work out the look of each cell from the current puzzle state
         for i in range(self.board_size):
             for j in range(self.board_size):
-                # Check if the cell is filled
-                if self.puzzle[i][j] != 0:
-                    x0 = self.margin + j * self.cell_dim
-                    y0 = self.margin + i * self.cell_dim
-                    x1 = (self.margin + j * self.cell_dim) + self.cell_dim
-                    y1 = (self.margin + i * self.cell_dim) + self.cell_dim
+                num = self.puzzle[i][j]
+                hint = self.original_puzzle[i][j] != 0
+                fill = ''
 
+                # Check if the cell is filled
+                if num != 0:
                     # Check if the win is raised
                     if not self.win:
                         # Check if the algorithm is running
-                        if self.collection["Moves"] and self.original_puzzle[i][j] == 0:
-                            # Highlight the correct cells in the algorithm
-                            if self.puzzle[i][j] == self.collection["Solution"][i][j] and streak:
-                                self.game_canvas.create_rectangle(
-                                    x0, y0, x1, y1, fill='SeaGreen3', width=0, tags="algo_filled")
+                        if self.collection["Moves"] and not hint:
+                            # Highlight the correct cells in the algorithm once the solution is known
+                            if self.collection["Solution"] is not None and num == self.collection["Solution"][i][j] and streak:
+                                fill = 'SeaGreen3'
 
                             # Highlight the current cell in the algorithm
-                            elif i == self.collection["Moves"][0][0] and j == self.collection["Moves"][0][1]:
+                            elif self.current_move and i == self.current_move[0] and j == self.current_move[1]:
                                 streak = False
-                                self.game_canvas.create_rectangle(
-                                    x0, y0, x1, y1, fill='plum1', width=0, tags="algo_current")
+                                fill = 'plum1'
 
                             # Highlight the filled cells in the algorithm
                             else:
                                 streak = False
-                                self.game_canvas.create_rectangle(
-                                    x0, y0, x1, y1, fill='LightSkyBlue1', width=0, tags="algo_filled")
+                                fill = 'LightSkyBlue1'
+
+                        # Highlight player entries that repeat a digit within a row, column or sub matrix
+                        elif not self.collection["Moves"] and not hint and self.tracker.isConflicting(i, j):
+                            fill = 'light coral'
                     else:
                         # Universalize the color when the win flag is raised
-                        self.game_canvas.create_rectangle(
-                            x0, y0, x1, y1, fill='gold2', width=0, tags="solved_cells")
+                        fill = 'gold2'
 
                 # Highlight hint entries with gray boxes
-                if self.original_puzzle[i][j] != 0:
-                    self.game_canvas.create_rectangle(
-                        x0, y0, x1, y1, fill='slate gray', tags="locked_cells")
+                if hint:
+                    fill = 'slate gray'
 
-                # Differently format cell hint entries and player inputs
-                font = self.font+self.fontsize_large+" bold" if self.original_puzzle[i][j] != 0 else self.font+self.fontsize_large
-                color = "white" if self.original_puzzle[i][j] != 0 else "black"
-
-                # Draw entries into the canvas according to current puzzle state
-                if self.puzzle[i][j] != 0:
-                    x = self.margin + j * self.cell_dim + self.cell_dim / 2
-                    y = self.margin + i * self.cell_dim + self.cell_dim / 2
-                    self.game_canvas.create_text(
-                        x, y, text=self.puzzle[i][j], tags="entries", fill=color, font=font)
-        
-        # Raise the priority of the grid
-        self.game_canvas.tag_raise("grid_lines")
-        self.game_canvas.tag_raise("grid_thick")
+                # Only reconfigure the cells whose look changed since the last frame
+                index = i * self.board_size + j
+                state = (num, fill)
+                if state == self.cell_states[index]:
+                    continue
+                self.cell_states[index] = state
+                rect, text = self.cell_items[index]
 
-        # Check if a cell is highlighted and raise the highlight border
-        if self.game_canvas.find_withtag("selected_highlight"):
-            self.game_canvas.tag_raise("selected_highlight")
-        if self.game_canvas.find_withtag("load"):
-            self.game_canvas.tag_raise("load")
+                # Differently format cell hint entries and player inputs
+                font = self.font+self.fontsize_large+" bold" if hint else self.font+self.fontsize_large
+                color = "white" if hint else "black"
+                self.game_canvas.itemconfigure(rect, fill=fill, width=1 if hint else 0)
+                self.game_canvas.itemconfigure(text, text=num if num else '', fill=color, font=font)
 
     def cellClicked(self, event):
         # Extract screen coordinates when function is called from button
@@ -347,74 +464,132 @@ class GameGUI(Frame):
                 # Enter the entry for a valid number
                 if event.keysym in "123456789":
                     self.puzzle[self.row][self.col] = int(event.char)
+                    self.tracker.set(self.row, self.col, int(event.char))
                     self.drawPuzzle()
+                    self.checkWin()
 
                 # Remove the entry if escape and backspace is clicked
                 elif event.keysym in ["Delete", "Escape", "BackSpace"]:
                     self.puzzle[self.row][self.col] = 0
+                    self.tracker.set(self.row, self.col, 0)
                     self.drawPuzzle()
+                    self.checkWin()
 
     def display_algo(self):
         # Check if the algorithm still needs to go through anymore steps
-        if self.collection["Moves"]:
-            # Select the earliest step in the collection and remove it from the list
-            self.puzzle[self.collection["Moves"][0][0]
-                        ][self.collection["Moves"][0][1]] = self.collection["Moves"][0][2]
-            self.collection["Moves"].pop(0)
-
-            # Update the GUI
-            self.drawPuzzle()
-            
+        player = self.collection["Moves"]
+        if player:
             # Check if the algorithm was already skipped
-            if not self.collection["Skip"]:
-                # Delayed recursion for next step
-                self.after(2, self.display_algo)
-            else:
-                # Reset moves and solve the puzzle
-                self.puzzle = self.collection["Solution"]
+            if self.collection["Skip"]:
+                # Let the solver finish without tracing and show its solution
+                self.collection["Solution"] = player.finish()
+                player.close()
                 self.collection["Moves"] = []
+                if self.collection["Solution"] != "Unsolvable":
+                    self.puzzle = self.collection["Solution"]
+                    self.tracker.load(self.puzzle)
+                    self.checkWin()
+            else:
+                # Work out how many moves are due at the chosen speed since the last frame
+                now = time.monotonic()
+                speed = self.speed_legend[self.speed_category]
+                due = speed * (now - self.last_frame) + self.move_credit if speed else float("inf")
+                self.last_frame = now
+
+                # Apply the due moves in chunks until the frame budget runs out, unless the scrubber is held
+                deadline = time.perf_counter() + self.frame_budget
+                while due >= 1 and not self.scrubbing and time.perf_counter() < deadline:
+                    applied = player.advance(int(min(due, 256)))
+                    if not applied:
+                        break
+                    due -= applied
+                self.move_credit = due % 1 if speed else 0
+
+                # Spend the rest of the frame pulling the trace ahead so the scrubber covers more of it
+                while not player.finished and time.perf_counter() < deadline:
+                    player.explore(256)
+
+                # Learn the solution once the solver is done, stopping right away when there is none
+                if player.finished and self.collection["Solution"] is None:
+                    self.collection["Solution"] = player.solution
+                if self.collection["Solution"] == "Unsolvable":
+                    player.close()
+                    self.collection["Moves"] = []
+                    self.showSubmenu("Menu")
+                    self.prompt_label.configure(text='[!] The Puzzle is Unsolvable')
+                    return
+
+                # Show the board and the position within the trace
+                self.puzzle = player.board
+                self.tracker.load(self.puzzle)
+                self.current_move = player.currentMove()
+                self.scrubber.configure(to=max(player.explored(), 1))
+                self.scrubber.set(player.position)
+
+                # Stop once the end of the trace is on the board
+                if player.isDone():
+                    self.collection["Moves"] = []
+
+                # Update the GUI
+                self.drawPuzzle()
+                self.checkWin()
+
+                # Delayed recursion for the next frame
+                if self.collection["Moves"]:
+                    self.after(self.frame_time, self.display_algo)
 
         # If the collection has already been skipped, reset it
         if self.collection["Skip"]:
             self.collection["Skip"] = False
 
+    def updateSpeed(self, option):
+        # Change the number of moves played back per second
+        self.speed_category = option
+
+    def seekPlayback(self, value):
+        # Jump within the trace unless the scrubber is only echoing the current position
+        player = self.collection["Moves"]
+        if player and int(float(value)) != player.position:
+            player.seek(int(float(value)))
+
+    def holdScrubber(self, held):
+        # Pause the playback while the scrubber is being dragged
+        self.scrubbing = held
+
     def solveBoard(self):
         # Only allow button functionality when algorithm isn't running
         if not self.collection["Moves"] and not self.loading:
             # Reset game variables
-            self.puzzle = deepcopy(self.original_puzzle)
-            self.timer = {"Hour": 0, "Minute": 0,
-                          "Second": 0, "Millisecond": 0, "Pause": True}
+            self.puzzle = self.original_puzzle.copy()
+            self.tracker.load(self.puzzle)
+            self.resetTimer(True)
 
-            # Call the function to run the algorithm
-            self.collection = algo.backtrack(deepcopy(self.original_puzzle), moves=[])
+            # Play the solver's steps back as they come, learning the solution once its search finishes
+            self.collection = {"Solution": None, "Moves": playback.Playback(self.puzzle), "Skip": False}
 
             # Reset win flag and timer
             if self.win:
                 self.win = False
 
-            # Run through each step to the solution
-            self.display_algo()
-
-            # Clear out the menu to make room for a new frame
-            self.submenu_frame.destroy()
-
-            # Create the Menu Frame and pack it into the frame
-            self.submenu_frame = Frame(self.menu_frame, width=self.width,
-                                    height=self.menu, bg="white")
-            self.submenu_frame.pack(fill='both')
+            # Swap the menu for the playback controls, starting the scrubber over
+            self.scrubber.configure(to=1)
+            self.scrubber.set(0)
+            self.speed_variable.set(self.speed_category)
+            self.showSubmenu("Solve")
 
-            # Insert menu buttons into the grid and bind each with a command
-            Button(self.submenu_frame, text="Skip", width=self.width-self.margin*2, height=self.margin, bg='ghost white', activebackground='azure',
-                relief='solid', font=self.font+self.fontsize_small, command=lambda: self.closeSubmenu("Solve")).pack(pady=(self.margin//2, 0))
+            # Run through the steps to the solution
+            self.scrubbing = False
+            self.move_credit = 0
+            self.last_frame = time.monotonic()
+            self.display_algo()
 
     def resetBoard(self):
         # Only allow button functionality when algorithm isn't running
         if not self.collection["Moves"] and not self.loading:
             # Reset game variables
-            self.puzzle = deepcopy(self.original_puzzle)
-            self.timer = {"Hour": 0, "Minute": 0,
-                          "Second": 0, "Millisecond": 0, "Pause": False}
+            self.puzzle = self.original_puzzle.copy()
+            self.tracker.load(self.puzzle)
+            self.resetTimer(False)
 
             # Reset win flag and timer
             if self.win:
@@ -423,16 +598,32 @@ class GameGUI(Frame):
             # Update the GUI
             self.drawPuzzle()
 
+    def fillPrefetch(self):
+        # Keep the prefetch queue topped up, blocking while it is full
+        while True:
+            self.prefetch.put(algo.generatePuzzle())
+
     def generatePuzzle(self):
         # Check if a puzzle is being generated
         if not self.loading:
             # Only allow button functionality when algorithm isn't running
             if not self.collection["Moves"]:
                 # Reset win flag and timer
-                self.timer = {"Hour": 0, "Minute": 0,
-                            "Second": 0, "Millisecond": 0, "Pause": True}
+                self.resetTimer(True)
                 if self.win:
                     self.win = False
+
+                # Take a random record of the corpus right away when there is one
+                if self.corpus is not None and len(self.corpus):
+                    self.placeGenerated(self.corpus.randomRecord()[0])
+                    return
+
+                # Take a ready puzzle right away when the prefetch queue has one
+                try:
+                    self.placeGenerated(self.prefetch.get_nowait())
+                    return
+                except queue.Empty:
+                    pass
                 
                 # Clear the canvas with a blank slate
                 self.game_canvas.create_rectangle(
@@ -452,8 +643,6 @@ class GameGUI(Frame):
                 y = self.height / 2
                 self.game_canvas.create_text(
                     x, y, text="Generating Puzzle", tags="load", fill="black", font=self.font+self.fontsize_large+" bold")
-                self.game_canvas.create_text(
-                    x, y+self.cell_dim//2, text="(This may take a while)", tags="load", fill="black", font=self.font+self.fontsize_small)
                 
                 # Set the game state as loading
                 self.loading = True
@@ -464,25 +653,33 @@ class GameGUI(Frame):
                 # Update the GUI
                 self.drawPuzzle()
                 
-                # Recurse the function to start generating after loading screen
-                self.after(500, self.generatePuzzle)
+                # Poll the prefetch queue until the background worker hands over a puzzle
+                self.after(50, self.generatePuzzle)
         elif self.loading:
-            # Only allow button functionality when algorithm isn't running
-            if not self.collection["Moves"]:
-                # Generate the puzzle and update the game board
-                self.original_puzzle = algo.generatePuzzle()
-                self.puzzle = deepcopy(self.original_puzzle)
-
-                # Remove the loading screen
-                self.game_canvas.delete("load")
-
-                # Reset the game variables
-                self.loading = False
-                self.timer["Pause"] = False
-                self.menu_buttons["Generate"].configure(command=self.generatePuzzle)
-
-                # Update the GUI
-                self.drawPuzzle()
+            # Check if the background worker has a puzzle ready
+            try:
+                puzzle = self.prefetch.get_nowait()
+            except queue.Empty:
+                self.after(50, self.generatePuzzle)
+                return
+
+            # Remove the loading screen
+            self.game_canvas.delete("load")
+
+            # Reset the game variables
+            self.loading = False
+            self.menu_buttons["Generate"].configure(command=self.generatePuzzle)
+            self.placeGenerated(puzzle)
+
+    def placeGenerated(self, puzzle):
+        # Update the game board with the generated puzzle and start the timer
+        self.original_puzzle = algo.Board.fromList(puzzle)
+        self.puzzle = self.original_puzzle.copy()
+        self.tracker.load(self.puzzle)
+        self.resumeTimer()
+
+        # Update the GUI
+        self.drawPuzzle()
 
     def inputPuzzle(self):
         # Only allow button functionality when algorithm isn't running
@@ -490,49 +687,38 @@ class GameGUI(Frame):
             # Reset win flag
             self.win = False
 
-            # Clear out the menu to make room for a new frame
-            self.submenu_frame.destroy()
-
             # re-initialize the board to get it ready for input
-            self.original_puzzle = [
-                [0 for col in range(self.board_size)] for row in range(self.board_size)]
-            self.puzzle = [[0 for col in range(self.board_size)]
-                           for row in range(self.board_size)]
+            self.original_puzzle = algo.Board(size=self.board_size)
+            self.puzzle = self.original_puzzle.copy()
+            self.tracker.load(self.puzzle)
             self.drawPuzzle()
             self.timer["Pause"] = True
 
-            # Create the Menu Frame and pack it into the frame
-            self.submenu_frame = Frame(self.menu_frame, width=self.width,
-                                    height=self.menu, bg="white")
-            self.submenu_frame.pack(fill='both')
-
-            # Insert menu buttons into the grid and bind each with a command
-            Button(self.submenu_frame, text="Enter", width=self.width-self.margin*2, height=self.margin, bg='ghost white', activebackground='azure',
-                relief='solid', font=self.font+self.fontsize_small, command=lambda: self.closeSubmenu("Input")).pack(pady=(self.margin//2, 0))
+            # Swap the menu for the button registering the input
+            self.showSubmenu("Input")
 
             # Display the prompt to the interface
             self.prompt_label.configure(text="Press Enter after the puzzle input")
-            
-            # Let the button fill the whole frame
-            self.submenu_frame.pack_propagate(0)
 
     def closeSubmenu(self, function):
         if function == "Input":
             # Check if the board is valid
             result = algo.boardValidation(self.puzzle)
             if not result:
-                # Check if board is actually solvable
-                if not algo.solvabilityChecker(deepcopy(self.puzzle)):
+                # Count the solutions of the board, stopping at the second one
+                solutions = algo.countSolutions(self.puzzle) if not algo.solvabilityChecker(self.puzzle.copy()) else 0
+                # Check if board has exactly one solution
+                if solutions == 1:
                     # Register the player input into the puzzle
-                    self.original_puzzle = deepcopy(self.puzzle)
+                    self.original_puzzle = self.puzzle.copy()
                     self.drawPuzzle()
 
-                    # Re-intialize the menu
-                    self.initMenu()
-
-                    # Reset the timer
-                    self.timer = {"Hour": 0, "Minute": 0,
-                                "Second": 0, "Millisecond": 0, "Pause": False}
+                    # Reset the timer and bring the main menu back
+                    self.resetTimer(False)
+                    self.showSubmenu("Menu")
+                elif solutions > 1:
+                    # Display the error prompt to the interface
+                    self.prompt_label.configure(text='[!] The Input Puzzle has Multiple Solutions')
                 else:
                     # Display the error prompt to the interface
                     self.prompt_label.configure(text='[!] The Input Puzzle is Unsolvable')
@@ -543,8 +729,8 @@ class GameGUI(Frame):
             # Skip the whole algorithm
             self.collection["Skip"] = True
         
-            # Re-intialize the menu
-            self.initMenu()
+            # Bring the main menu back
+            self.showSubmenu("Menu")
 
     def openSettings(self):
         # Only allow settings to open when algorithm isn't running
@@ -552,62 +738,90 @@ class GameGUI(Frame):
             # Pause the timer
             self.timer["Pause"] = True
 
-            # Clear out the frames to transition into settings
+            # Set the game screen aside to transition into settings
             if self.menu_frame != None:
-                self.menu_frame.destroy()
-                self.menu_frame = None
+                self.menu_frame.pack_forget()
             if self.game_canvas != None:
-                self.game_canvas.destroy()
-                self.game_canvas = None
+                self.game_canvas.pack_forget()
 
-            # Initialize settings frame
-            self.settings_frame = Frame(
-                self, width=self.width, height=self.height + self.menu, bg="white")
+            # Initialize settings frame the first time it is opened, laying it out again only when the look changed
+            if self.settings_frame is None:
+                self.initSettings()
+            if self.settings_layout != (self.screen_size, self.font):
+                self.layoutSettings()
             self.settings_frame.pack(fill='both')
 
-            Label(self.settings_frame, text="< ~ SETTINGS ~ >",
-                  bg="white", font=self.font+self.fontsize_large+" bold", width=self.margin).pack(fill='both', padx=self.margin, pady=(self.margin, self.margin//2))
-
-            # Initialize variables for each option
-            option_var = [self.screen_size_category, self.font]
-            option_labels = ["Screen Size", "Font"]
-            option_choices = [
-                ("Even Smaller", "Smaller", "Default", "Larger", "Even Larger"), ("Inconsolata ", "Cambria ", "Helvetica ", "Times ")]
-            # Loop for each option in the settings
-            for i in range(2):
-                # Create a frame for each option row
-                setting = Frame(self.settings_frame, width=self.width, height=self.height + self.menu, bg="white")
-                setting.pack(fill='both', pady=self.margin//2)
-
-                # Create a label for the screen size option
-                Label(setting, text=option_labels[i]+':', bg="white", font=self.font+self.fontsize_small+" bold", width=self.margin).pack(side='left', fill='both', padx=self.margin)
-
-                # Set a variable for the option menu
-                variable = StringVar()
-                variable.set(option_var[i])
-
-                # Create the options menu for screen sizes
-                option_menu = OptionMenu(setting, variable, *option_choices[i], command=self.updateSettings)
-                option_menu.pack(fill='both', padx=(0, self.margin))
-                option_menu.config(font=self.font+self.fontsize_small, bg='ghost white', activebackground='azure', relief='groove', highlightthickness=0)
-
-            # Create the button to get back to the game
-            Button(self.settings_frame, text="Apply", width=self.margin, bg='ghost white', activebackground='azure', font=self.font+self.fontsize_small, relief='solid', command=self.closeSettings).pack(padx=self.margin, pady=self.margin)
-
-            # Let the frame be fully filled
-            self.settings_frame.pack_propagate(0)
+    def initSettings(self):
+        # Initialize settings frame
+        self.settings_frame = Frame(self, bg="white")
+        title = Label(self.settings_frame, text="< ~ SETTINGS ~ >", bg="white")
+        title.pack(fill='both')
+
+        # Initialize variables for each option
+        option_labels = ["Screen Size", "Font"]
+        option_choices = [
+            ("Even Smaller", "Smaller", "Default", "Larger", "Even Larger"), ("Inconsolata ", "Cambria ", "Helvetica ", "Times ")]
+        rows = []
+        # Loop for each option in the settings
+        for i in range(2):
+            # Create a frame for each option row
+            setting = Frame(self.settings_frame, bg="white")
+            setting.pack(fill='both')
+
+            # Create a label for the option
+            label = Label(setting, text=option_labels[i]+':', bg="white")
+            label.pack(side='left', fill='both')
+
+            # Set a variable for the option menu
+            variable = StringVar()
+
+            # Create the options menu for the option
+            option_menu = OptionMenu(setting, variable, *option_choices[i], command=self.updateSettings)
+            option_menu.pack(fill='both')
+            option_menu.config(bg='ghost white', activebackground='azure', relief='groove', highlightthickness=0)
+            rows.append((setting, label, variable, option_menu))
+
+        # Create the button to get back to the game
+        apply = Button(self.settings_frame, text="Apply", bg='ghost white', activebackground='azure', relief='solid', command=self.closeSettings)
+        apply.pack()
+
+        # Let the frame be fully filled
+        self.settings_frame.pack_propagate(0)
+        self.settings_widgets = {"Title": title, "Options": rows, "Apply": apply}
+
+    def layoutSettings(self):
+        # Resize and restyle the settings widgets in place for the current screen size and font
+        widgets = self.settings_widgets
+        self.settings_frame.configure(width=self.width, height=self.height + self.menu)
+        widgets["Title"].configure(font=self.font+self.fontsize_large+" bold", width=self.margin)
+        widgets["Title"].pack_configure(padx=self.margin, pady=(self.margin, self.margin//2))
+        for (setting, label, variable, option_menu), value in zip(widgets["Options"], [self.screen_size_category, self.font]):
+            setting.configure(width=self.width, height=self.height + self.menu)
+            setting.pack_configure(pady=self.margin//2)
+            label.configure(font=self.font+self.fontsize_small+" bold", width=self.margin)
+            label.pack_configure(padx=self.margin)
+            variable.set(value)
+            option_menu.config(font=self.font+self.fontsize_small)
+            option_menu.pack_configure(padx=(0, self.margin))
+        widgets["Apply"].configure(width=self.margin, font=self.font+self.fontsize_small)
+        widgets["Apply"].pack_configure(padx=self.margin, pady=self.margin)
+        self.settings_layout = (self.screen_size, self.font)
 
     def closeSettings(self):
         # Restart the timer
-        self.timer["Pause"] = False
-
-        # Clear out the settings frame
-        self.settings_frame.destroy()
-        self.settings_frame = None
-
-        # Re-initialize the game screen
-        self.initBoard()
-        self.initMenu()
+        self.resumeTimer()
+
+        # Set the settings frame aside
+        self.settings_frame.pack_forget()
+
+        # Bring the game screen back, laying the board and menu out again only when the look changed
+        if self.board_layout != (self.screen_size, self.font):
+            self.initBoard()
+        else:
+            self.game_canvas.pack(fill='both', side='top')
+        if self.menu_layout != (self.screen_size, self.font):
+            self.layoutMenu()
+        self.menu_frame.pack()
 
     def updateSettings(self, option):
         # Update the font used but the GUI
@@ -631,13 +845,12 @@ class GameGUI(Frame):
             self.menu = self.margin * 2 + self.cell_dim * 2 
             root.geometry(str(self.width) + "x" + str(self.height + self.menu))
 
-        # Reset the settings
-        self.settings_frame.destroy()
-        self.openSettings()
+        # Lay the settings out again for the new look
+        self.layoutSettings()
 
 # Initialize root window
 root = Tk()
-# Initialize GUI Class
-GameGUI(root)
+# Initialize GUI Class, drawing puzzles from the corpus file given on the command line if any
+GameGUI(root, sys.argv[1] if len(sys.argv) > 1 else None)
 # Instigate Loop
 root.mainloop()
@@ -0,0 +1,250 @@
+# Import necessary libraries
+import argparse
+import queue
+import sys
+import time
+from multiprocessing import Event, Pool, Queue, Value, cpu_count
+
+# Import Created Libraries
+import algorithm as algo
+
+# Initialize the queues, counters and signals shared with the workers of a search
+shared = {}
+
+# Initialize the solutions found by the worker within its current task
+found_solutions = []
+
+
+def bestCell(state):
+    # Find the open cell with the fewest candidates
+    best, best_count = None, state.geometry.board_size + 1
+    for cell in range(state.geometry.total_cells):
+        if not state.values[cell]:
+            count = bin(state.candidates[cell]).count("1")
+            if count < best_count:
+                best, best_count = cell, count
+                if count == 2:
+                    break
+    return best
+
+
+def splitTop(puzzle, target, limit):
+    # Expand the top levels of the search tree breadth first until there is enough work to spread
+    state = algo.Propagator(puzzle, subsets=False, locked=False)
+    if state.error is not None:
+        return [], []
+    frontier, solutions = [state], []
+    while frontier and len(frontier) < target and len(solutions) < limit:
+        expanded = []
+        for state in frontier:
+            if not state.propagate():
+                continue
+            best = bestCell(state)
+            if best is None:
+                solutions.append(state.values[:])
+                continue
+            free = state.candidates[best]
+            while free:
+                bit = free & -free
+                free ^= bit
+                branch = state.copy()
+                if branch.assign(best, bit.bit_length(), None):
+                    expanded.append(branch)
+        frontier = expanded
+    return [bytes(state.values) for state in frontier], solutions
+
+
+def initWorker(tasks, idle, outstanding, stop, solved, limit, track):
+    shared.update(tasks=tasks, idle=idle, outstanding=outstanding, stop=stop, solved=solved, limit=limit, track=track)
+
+
+def shareBranches(state, cell, free):
+    # Hand the untried candidates of the cell to the idle workers, counting them before they can finish
+    tasks = []
+    while free:
+        bit = free & -free
+        free ^= bit
+        values = state.values[:]
+        values[cell] = bit.bit_length()
+        tasks.append(bytes(values))
+    with shared["outstanding"].get_lock():
+        shared["outstanding"].value += len(tasks)
+    for task in tasks:
+        shared["tasks"].put(task)
+
+
+def splitStates(state, moves, limit):
+    # Give up once the other workers found enough solutions
+    if shared["stop"].is_set() or not state.propagate():
+        return 0
+
+    # Set Base Case as the board being completely filled, stopping everyone once the limit is reached
+    best = bestCell(state)
+    if best is None:
+        found_solutions.append(state.values[:])
+        with shared["solved"].get_lock():
+            shared["solved"].value += 1
+            if shared["solved"].value >= shared["limit"]:
+                shared["stop"].set()
+        return 1
+
+    # Branch on each candidate, splitting off the rest whenever a worker runs out of work
+    x, y = state.geometry.cell_row[best], state.geometry.cell_col[best]
+    total = 0
+    free = state.candidates[best]
+    while free and total < limit:
+        bit = free & -free
+        free ^= bit
+        if free and shared["idle"].value > 0:
+            shareBranches(state, best, free)
+            free = 0
+        branch = state.copy() if free else state
+        if moves is not None:
+            moves.append([x, y, bit.bit_length()])
+        if branch.assign(best, bit.bit_length(), None):
+            total += splitStates(branch, moves, limit - total)
+            if total and moves is not None:
+                return total
+
+        # Reset every entry the branch placed and update the moves list
+        if moves is not None and branch is not state:
+            for cell in range(state.geometry.total_cells):
+                if branch.values[cell] and not state.values[cell]:
+                    moves.append([state.geometry.cell_row[cell], state.geometry.cell_col[cell], 0])
+            if not branch.values[best]:
+                moves.append([x, y, 0])
+    return total
+
+
+def splitWorker(size):
+    # Take tasks off the shared queue until a solution stops the search or no work is left anywhere
+    tasks, idle, outstanding, stop = shared["tasks"], shared["idle"], shared["outstanding"], shared["stop"]
+    count, solution, start, moves = 0, None, None, None
+    waiting = False
+    while not stop.is_set():
+        try:
+            task = tasks.get(timeout=0.005)
+        except queue.Empty:
+            # Let the busy workers know there is room to split their work
+            if not waiting:
+                waiting = True
+                with idle.get_lock():
+                    idle.value += 1
+            if outstanding.value == 0:
+                break
+            continue
+        if waiting:
+            waiting = False
+            with idle.get_lock():
+                idle.value -= 1
+
+        # Search the subproblem, logging the moves only when looking for a solution
+        local = [] if shared["track"] else None
+        del found_solutions[:]
+        state = algo.Propagator(algo.Board(task, size), subsets=False, locked=False, moves=local)
+        if state.error is None:
+            count += splitStates(state, local, shared["limit"])
+        if found_solutions and solution is None:
+            solution, start, moves = found_solutions[0], list(task), local
+        with outstanding.get_lock():
+            outstanding.value -= 1
+
+    if waiting:
+        with idle.get_lock():
+            idle.value -= 1
+    return count, solution, start, moves
+
+
+def parallelSearch(puzzle, limit, track, processes=None, split=4):
+    # Split the top of the tree, answering right away when that already settles the search
+    processes = processes or cpu_count()
+    size = len(puzzle)
+    tasks, solutions = splitTop(puzzle, processes * split, limit)
+    if len(solutions) >= limit or not tasks:
+        return [(len(solutions), solutions[0] if solutions else None, None, None)]
+
+    # Initialize the shared queue of subproblems with the number of them still being searched
+    task_queue, idle, outstanding = Queue(), Value("i", 0), Value("i", len(tasks))
+    stop, solved = Event(), Value("i", len(solutions))
+    for task in tasks:
+        task_queue.put(task)
+
+    try:
+        with Pool(processes, initializer=initWorker, initargs=(task_queue, idle, outstanding, stop, solved, limit, track)) as pool:
+            results = [pool.apply_async(splitWorker, (size,)) for worker in range(processes)]
+            results = [result.get() for result in results]
+    finally:
+        # Drop the subproblems left behind by a cancelled search
+        task_queue.cancel_join_thread()
+        task_queue.close()
+    return [(len(solutions), solutions[0] if solutions else None, None, None)] + results
+
+
+def parallelSolve(puzzle, moves=None, processes=None, split=4):
+    # Initialize the moves list when none is passed
+    if moves is None:
+        moves = []
+
+    # Search the subproblems on every worker, keeping the first solution found
+    for count, solution, start, local in parallelSearch(puzzle, 1, True, processes, split):
+        if solution is not None:
+            break
+    else:
+        return {"Solution": "Unsolvable", "Moves": [], "Skip": False}
+
+    # Lead the moves with the entries the split placed before the worker took over
+    size = len(puzzle)
+    if start is None:
+        # The split settled the puzzle by itself, so its placements lead straight to the solution
+        start, local = solution, []
+    moves.extend([cell // size, cell % size, start[cell]] for cell in range(size * size)
+                 if start[cell] and not puzzle[cell // size][cell % size])
+    moves.extend(local)
+    for cell in range(size * size):
+        puzzle[cell // size][cell % size] = solution[cell]
+    return {"Solution": puzzle, "Moves": moves, "Skip": False}
+
+
+def parallelCount(puzzle, limit=2, processes=None, split=4):
+    # Merge the solutions counted by every worker, up to the limit
+    if algo.boardValidation(puzzle):
+        return 0
+    return min(limit, sum(count for count, solution, start, moves in parallelSearch(puzzle, limit, False, processes, split)))
+
+
+def main(argv=None):
+    # Parse the command line options
+    parser = argparse.ArgumentParser(description="Solve hard or large puzzles one at a time, splitting the search over every core.")
+    parser.add_argument("input", nargs="?", default="-", help="file with one puzzle per line (default: stdin)")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--split", type=int, default=4, help="subproblems per worker to split the top of the tree into")
+    parser.add_argument("--count", type=int, default=None, help="count solutions up to this limit instead of solving")
+    args = parser.parse_args(argv)
+
+    # Solve each puzzle in turn and report the time it took to stderr
+    source = sys.stdin if args.input == "-" else open(args.input)
+    try:
+        for line in source:
+            if not line.strip():
+                continue
+            puzzle = algo.parsePuzzle(line)
+            start = time.perf_counter()
+            if puzzle is None:
+                result = "[!] Invalid puzzle line"
+            elif args.count:
+                result = str(parallelCount(puzzle, args.count, args.processes, args.split))
+            else:
+                result = algo.boardValidation(puzzle)
+                if not result:
+                    solution = parallelSolve(puzzle, processes=args.processes, split=args.split)["Solution"]
+                    result = "[!] Unsolvable" if solution == "Unsolvable" else algo.formatPuzzle(solution)
+            sys.stdout.write(result + "\n")
+            sys.stdout.flush()
+            sys.stderr.write("Finished in {:.2f}s\n".format(time.perf_counter() - start))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+if __name__ == "__main__":
+    main()
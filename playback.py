@@ -0,0 +1,95 @@
+# Import necessary libraries
+from array import array
+
+# Import Created Libraries
+import algorithm as algo
+
+
+class Playback:
+    def __init__(self, puzzle, interval=1024):
+        # Initialize the board shown to the player and the board the solver works on
+        self.board = algo.Board.fromList(puzzle)
+        self.frontier = self.board.copy()
+        self.steps = algo.solveSteps(self.frontier)
+        self.finished = False
+        self.solution = None
+
+        # Initialize the trace as three bytes per move and a copy of the board every interval moves
+        self.trace = array('B')
+        self.interval = interval
+        self.checkpoints = [bytes(self.board.cells)]
+        self.position = 0
+
+    def explored(self):
+        # Report the number of moves pulled from the solver so far
+        return len(self.trace) // 3
+
+    def explore(self, count):
+        # Pull up to count more moves from the solver into the trace
+        pulled = 0
+        while pulled < count and not self.finished:
+            try:
+                move = next(self.steps)
+            except StopIteration as stop:
+                self.finish(stop.value)
+                break
+            self.trace.extend(move)
+            pulled += 1
+
+            # Keep a copy of the board the solver reached every interval moves
+            if self.explored() % self.interval == 0:
+                self.checkpoints.append(bytes(self.frontier.cells))
+        return pulled
+
+    def finish(self, solved=None):
+        # Run the solver to the end without recording the rest of the trace, then keep the board it reached
+        if self.finished:
+            return self.solution
+        while solved is None:
+            try:
+                next(self.steps)
+            except StopIteration as stop:
+                solved = stop.value
+        self.finished = True
+        self.solution = self.frontier.copy() if solved else "Unsolvable"
+        return self.solution
+
+    def advance(self, count):
+        # Pull in the moves needed that the solver has not made yet
+        target = self.position + count
+        if target > self.explored():
+            self.explore(target - self.explored())
+        target = min(target, self.explored())
+
+        # Apply the moves straight onto the cells of the board
+        cells, size, trace = self.board.cells, self.board.geometry.board_size, self.trace
+        for index in range(self.position * 3, target * 3, 3):
+            cells[trace[index] * size + trace[index + 1]] = trace[index + 2]
+        applied = target - self.position
+        self.position = target
+        return applied
+
+    def seek(self, position):
+        # Restore the closest checkpoint when going back or jumping past the next one, then replay the rest
+        position = max(0, min(position, self.explored()))
+        checkpoint = position // self.interval
+        if position < self.position or checkpoint > self.position // self.interval:
+            self.board.cells[:] = self.checkpoints[checkpoint]
+            self.position = checkpoint * self.interval
+        self.advance(position - self.position)
+
+    def currentMove(self):
+        # Return the last move applied to the board
+        if not self.position:
+            return None
+        index = (self.position - 1) * 3
+        return list(self.trace[index:index + 3])
+
+    def isDone(self):
+        # Check if the board shows the end of the whole trace
+        return self.finished and self.position == self.explored()
+
+    def close(self):
+        # Abandon the solver
+        self.steps.close()
+        self.finished = True
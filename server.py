@@ -0,0 +1,270 @@
+# Import necessary libraries
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import cpu_count
+
+# Import Created Libraries
+import algorithm as algo
+
+# Initialize the default address, which only ever listens on this machine
+default_host = "127.0.0.1"
+default_port = 8765
+
+
+def warmWorker():
+    # Build the lookup tables of every supported size once per worker instead of on the first request
+    for sub in range(2, 6):
+        algo.getGeometry(sub * sub)
+
+
+def readPuzzle(request):
+    # Accept the puzzle as a single line or as a list of rows
+    puzzle = request.get("puzzle")
+    if isinstance(puzzle, list):
+        size = len(puzzle)
+        if all(isinstance(row, list) and len(row) == size and all(isinstance(num, int) and 0 <= num <= size for num in row) for row in puzzle):
+            puzzle = algo.formatPuzzle(puzzle)
+    puzzle = algo.parsePuzzle(puzzle) if isinstance(puzzle, str) else None
+    if puzzle is None:
+        raise ValueError("Invalid puzzle")
+    return puzzle
+
+
+def solveRequest(request):
+    puzzle = readPuzzle(request)
+    result = algo.boardValidation(puzzle)
+    if result:
+        return {"solution": None, "error": result}
+    engine = request.get("engine")
+    if engine == "backtrack":
+        # The row-major backtracking keeps its own signature and skips propagation
+        solution = algo.backtrack(puzzle)["Solution"]
+    else:
+        solution = algo.solve(puzzle, engine=engine)["Solution"]
+    if solution == "Unsolvable":
+        return {"solution": None, "error": "[!] Unsolvable"}
+    return {"solution": algo.formatPuzzle(solution)}
+
+
+def validateRequest(request):
+    # Check for repeated entries, then for contradictions found by propagating when asked to
+    puzzle = readPuzzle(request)
+    result = algo.solvabilityChecker(puzzle) if request.get("solvable", True) else algo.boardValidation(puzzle)
+    return {"valid": not result, "error": result}
+
+
+def countRequest(request):
+    limit = int(request.get("limit", 2))
+    return {"count": algo.countSolutions(readPuzzle(request), limit)}
+
+
+def generateRequest(request):
+    size = int(request.get("size", algo.board_size))
+    if size not in (4, 9, 16, 25):
+        raise ValueError("Unsupported board size: " + str(size))
+    puzzle = algo.generatePuzzle(request.get("symmetry", "none"), bool(request.get("minimal", False)), size)
+    return {"puzzle": algo.formatPuzzle(puzzle)}
+
+
+# Initialize the handler of each operation
+operations = {"solve": solveRequest, "validate": validateRequest, "count-solutions": countRequest, "generate": generateRequest}
+
+
+def handleBatch(requests):
+    # Answer each request of a batch within the worker, reporting failures in place of the result
+    responses = []
+    for request in requests:
+        try:
+            response = operations[request["op"]](request)
+        except Exception as error:
+            response = {"error": "[!] " + str(error)}
+        response["id"] = request.get("id")
+        responses.append(response)
+    return responses
+
+
+class SolverServer:
+    def __init__(self, processes=None, batch_size=32, batch_delay=0.002, queue_size=1024, in_flight=None):
+        # Initialize the pool size and the batching limits
+        self.processes = processes or cpu_count()
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.queue_size = queue_size
+        self.in_flight = in_flight or self.processes * 2
+        self.pool = None
+        self.queue = None
+        self.slots = None
+        self.batcher = None
+        self.server = None
+
+    async def start(self, path=None, host=default_host, port=default_port):
+        # Start the worker processes and wait until each has loaded the solver
+        loop = asyncio.get_running_loop()
+        self.pool = ProcessPoolExecutor(self.processes, initializer=warmWorker)
+        await asyncio.gather(*[loop.run_in_executor(self.pool, handleBatch, []) for worker in range(self.processes)])
+
+        # Initialize the bounded queue readers wait on once it fills up, and the limit on batches in the pool
+        self.queue = asyncio.Queue(self.queue_size)
+        self.slots = asyncio.Semaphore(self.in_flight)
+        self.batcher = asyncio.create_task(self.batchRequests())
+
+        # Listen on a Unix socket when a path is given, otherwise on the loopback interface only
+        if path:
+            if os.path.exists(path):
+                os.unlink(path)
+            self.server = await asyncio.start_unix_server(self.handleConnection, path)
+        else:
+            self.server = await asyncio.start_server(self.handleConnection, host, port)
+        return self.server
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.batcher:
+            self.batcher.cancel()
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def handleConnection(self, reader, writer):
+        # Initialize the lock keeping responses of different batches from interleaving
+        lock = asyncio.Lock()
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                # Answer malformed lines right away without bothering the pool
+                request = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Requests must be JSON objects")
+                    if request.get("op") not in operations:
+                        raise ValueError("Unknown operation: " + str(request.get("op")))
+                except ValueError as error:
+                    request_id = request.get("id") if isinstance(request, dict) else None
+                    await self.respond(writer, lock, [{"id": request_id, "error": "[!] " + str(error)}])
+                    continue
+
+                # Stop reading from the client while the queue is full
+                future = asyncio.get_running_loop().create_future()
+                await self.queue.put((request, future))
+                task = asyncio.ensure_future(self.forward(future, writer, lock))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            # Finish answering the requests already read before closing
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def forward(self, future, writer, lock):
+        await self.respond(writer, lock, [await future])
+
+    async def respond(self, writer, lock, responses):
+        # Write the responses and wait for slow clients to catch up
+        async with lock:
+            writer.write("".join(json.dumps(response) + "\n" for response in responses).encode())
+            await writer.drain()
+
+    async def batchRequests(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for a free slot in the pool, then for the first request of the batch
+            await self.slots.acquire()
+            batch = [await self.queue.get()]
+
+            # Gather more requests until the batch is full or the delay has passed
+            deadline = loop.time() + self.batch_delay
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+            task = loop.run_in_executor(self.pool, handleBatch, [request for request, future in batch])
+            task.add_done_callback(lambda task, batch=batch: self.finishBatch(task, batch))
+
+    def finishBatch(self, task, batch):
+        # Hand each response back to the connection waiting on it and free the slot
+        self.slots.release()
+        if task.cancelled():
+            return
+        error = task.exception()
+        for index, (request, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_result({"id": request.get("id"), "error": "[!] " + str(error)})
+            else:
+                future.set_result(task.result()[index])
+
+
+def call(requests, path=None, host=default_host, port=default_port):
+    # Send the requests to a running server and return the responses in the order of the requests
+    if path:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(path)
+    else:
+        connection = socket.create_connection((host, port))
+    with connection, connection.makefile("rw") as stream:
+        requests = [dict(request, id=index) for index, request in enumerate(requests)]
+        for request in requests:
+            stream.write(json.dumps(request) + "\n")
+        stream.flush()
+        connection.shutdown(socket.SHUT_WR)
+        responses = [json.loads(line) for line in stream]
+    responses.sort(key=lambda response: response["id"] if response["id"] is not None else -1)
+    return responses
+
+
+async def serve(args):
+    server = SolverServer(args.processes, args.batch, args.delay / 1000, args.queue)
+    await server.start(args.socket, args.host, args.port)
+    where = args.socket or "{}:{}".format(args.host, args.port)
+    sys.stderr.write("Serving on {} with {} workers\n".format(where, server.processes))
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    # Parse the command line options
+    parser = argparse.ArgumentParser(description="Answer solve, validate, count-solutions and generate requests sent as JSON lines.")
+    parser.add_argument("--socket", default=None, help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--host", default=default_host, help="local address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=default_port, help="TCP port to listen on")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--batch", type=int, default=32, help="most requests handed to a worker at once")
+    parser.add_argument("--delay", type=float, default=2, help="milliseconds to wait for a batch to fill")
+    parser.add_argument("--queue", type=int, default=1024, help="requests queued before clients are made to wait")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# Import necessary libraries
+import argparse
+import sys
+import time
+from itertools import islice
+
+import numpy as np
+
+# Import Created Libraries
+import algorithm as algo
+
+# Initialize the number of boards validated or propagated at once to keep memory bounded
+chunk_boards = 65536
+
+
+def unitViews(boards):
+    # Stack the rows, columns and sub matrices of every board as (N, 3 * size, size)
+    count, size = boards.shape[0], boards.shape[1]
+    sub = algo.getGeometry(size).sub_size
+    cols = boards.transpose(0, 2, 1)
+    subs = boards.reshape(count, sub, sub, sub, sub).transpose(0, 1, 3, 2, 4).reshape(count, size, size)
+    return np.concatenate((boards, cols, subs), axis=1)
+
+
+def validateBoards(boards):
+    # Convert the input into an (N, size, size) integer array of a supported board size
+    boards = np.asarray(boards, dtype=np.int64)
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+        raise ValueError("Expected boards with shape (N, size, size), got " + str(boards.shape))
+    algo.getGeometry(boards.shape[1])
+
+    # Initialize the verdict of every board and the first unit that repeats a digit
+    valid = np.ones(boards.shape[0], dtype=bool)
+    unit = np.full(boards.shape[0], -1, dtype=np.int64)
+
+    for start in range(0, boards.shape[0], chunk_boards):
+        units = unitViews(boards[start:start + chunk_boards])
+
+        # Turn each entry into a digit bit, leaving empty cells as zero
+        bits = np.where(units > 0, np.left_shift(1, units), 0)
+
+        # A unit repeats a digit exactly when the sum of its bits differs from their union
+        conflicts = bits.sum(axis=2) != np.bitwise_or.reduce(bits, axis=2)
+        repeated = conflicts.any(axis=1)
+        valid[start:start + chunk_boards] = ~repeated
+        unit[start:start + chunk_boards] = np.where(repeated, conflicts.argmax(axis=1), -1)
+
+    return {"Valid": valid, "Unit": unit}
+
+
+def propagateChunk(values, units, cell_units, all_digits):
+    # Initialize the boards still changing and the candidates of every cell
+    size = units.shape[1]
+    error = np.zeros(values.shape[0], dtype=bool)
+    candidates = np.full(values.shape, all_digits, dtype=np.int32)
+    active = np.arange(values.shape[0])
+
+    while active.size:
+        current = values[active]
+        empty = current == 0
+        bits = np.where(empty, 0, np.left_shift(1, np.maximum(current - 1, 0)))
+
+        # Gather the digits placed within each unit, catching the units that repeat one
+        unit_bits = bits[:, units]
+        taken = np.bitwise_or.reduce(unit_bits, axis=2)
+        failed = (unit_bits.sum(axis=2) != taken).any(axis=1)
+
+        # Narrow the candidates of every open cell down to the digits none of its units hold
+        peer_taken = taken[:, cell_units[:, 0]] | taken[:, cell_units[:, 1]] | taken[:, cell_units[:, 2]]
+        cands = np.where(empty, candidates[active] & ~peer_taken, bits)
+        failed |= (empty & (cands == 0)).any(axis=1)
+
+        # Track the digits seen at least once and more than once over the cells of each unit
+        unit_cands = cands[:, units]
+        once = np.zeros(taken.shape, dtype=np.int32)
+        twice = np.zeros(taken.shape, dtype=np.int32)
+        for index in range(size):
+            twice |= once & unit_cands[:, :, index]
+            once |= unit_cands[:, :, index]
+        failed |= (once != all_digits).any(axis=1)
+
+        # Naked singles have one candidate left, hidden singles are the only place left for a digit in a unit
+        unique = once & ~twice
+        hidden = cands & (unique[:, cell_units[:, 0]] | unique[:, cell_units[:, 1]] | unique[:, cell_units[:, 2]])
+        single = np.where(empty, np.where(cands & (cands - 1), hidden, cands), 0)
+        failed |= (single & (single - 1) != 0).any(axis=1)
+
+        # Place every single on the boards without a contradiction
+        place = (single != 0) & ~failed[:, None]
+        values[active] = np.where(place, np.log2(np.maximum(single, 1)).astype(np.int32) + 1, current)
+        candidates[active] = cands
+        error[active[failed]] = True
+        active = active[place.any(axis=1)]
+
+    return error
+
+
+def propagateBoards(boards):
+    # Convert the input into an (N, size, size) integer array of a supported board size
+    boards = np.asarray(boards, dtype=np.int32)
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+        raise ValueError("Expected boards with shape (N, size, size), got " + str(boards.shape))
+    geometry = algo.getGeometry(boards.shape[1])
+    units, cell_units = np.array(geometry.units), np.array(geometry.cell_units)
+
+    # Fill in the naked and hidden singles of every board, a chunk at a time
+    values = boards.reshape(boards.shape[0], -1).copy()
+    error = np.zeros(boards.shape[0], dtype=bool)
+    for start in range(0, boards.shape[0], chunk_boards):
+        error[start:start + chunk_boards] = propagateChunk(values[start:start + chunk_boards], units, cell_units, geometry.all_digits)
+
+    # Like solvabilityChecker, a board errs when it repeats a digit or propagation runs into a contradiction
+    solved = ~error & (values > 0).all(axis=1)
+    return {"Boards": values.reshape(boards.shape), "Solved": solved, "Error": error}
+
+
+def solveBoards(boards, engine=None):
+    # Propagate every board at once, then search only the boards propagation left open
+    result = propagateBoards(boards)
+    solutions, solved = result["Boards"], result["Solved"].copy()
+    for index in np.flatnonzero(~solved & ~result["Error"]):
+        solution = algo.solve(solutions[index].tolist(), engine=engine)["Solution"]
+        if solution != "Unsolvable":
+            solutions[index] = solution
+            solved[index] = True
+    return {"Boards": solutions, "Solved": solved, "Error": result["Error"]}
+
+
+def solveLines(lines, engine=None):
+    # Parse the lines and solve the boards of each size together, reporting errors in place of the solution
+    puzzles = [algo.parsePuzzle(line) for line in lines]
+    results = ["[!] Invalid puzzle line"] * len(puzzles)
+    for size in set(len(puzzle) for puzzle in puzzles if puzzle is not None):
+        indices = [index for index, puzzle in enumerate(puzzles) if puzzle is not None and len(puzzle) == size]
+        solved = solveBoards([puzzles[index] for index in indices], engine)
+        for position, index in enumerate(indices):
+            if solved["Solved"][position]:
+                results[index] = algo.formatPuzzle(solved["Boards"][position])
+            else:
+                results[index] = algo.boardValidation(puzzles[index]) or "[!] Unsolvable"
+    return results
+
+
+def main(argv=None):
+    # Parse the command line options
+    parser = argparse.ArgumentParser(description="Solve large batches of puzzles given one per line, propagating whole chunks at once.")
+    parser.add_argument("input", nargs="?", default="-", help="file with one puzzle per line (default: stdin)")
+    parser.add_argument("--engine", default=None, choices=sorted(algo.engines), help="engine for the boards propagation leaves open")
+    parser.add_argument("--chunksize", type=int, default=chunk_boards, help="puzzles propagated together")
+    args = parser.parse_args(argv)
+
+    # Stream the solutions to stdout in input order and report the throughput to stderr
+    source = sys.stdin if args.input == "-" else open(args.input)
+    start = time.perf_counter()
+    solved = 0
+    try:
+        lines = (line for line in source if line.strip())
+        while True:
+            chunk = list(islice(lines, args.chunksize))
+            if not chunk:
+                break
+            for result in solveLines(chunk, args.engine):
+                sys.stdout.write(result + "\n")
+            solved += len(chunk)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    elapsed = time.perf_counter() - start
+    sys.stderr.write("Solved {} puzzles in {:.2f}s ({:.0f} puzzles/s)\n".format(solved, elapsed, solved / elapsed if elapsed else 0))
+
+
+if __name__ == "__main__":
+    main()